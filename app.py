@@ -1,437 +1,351 @@
-
-import React, { useState, useMemo } from 'react';
-import { 
-  XAxis, YAxis, CartesianGrid, Tooltip, ResponsiveContainer, AreaChart, Area, Line
-} from 'recharts';
-import { 
-  TrendingUp, 
-  DollarSign, 
-  Percent, 
-  Calendar, 
-  Settings2,
-  Hotel,
-  Activity,
-  BarChart3,
-  Coins,
-  ShieldAlert,
-  Zap,
-  CheckCircle2
-} from 'lucide-react';
-import { HISTORICAL_DATA, INITIAL_INVESTMENT } from './constants';
-import { formatCurrency, formatPercentage, generateProjections, calculateAnnualAggregates } from './utils/finance';
-import { SummaryCard } from './components/SummaryCard';
-
-type Scenario = 'pessimistic' | 'moderate' | 'optimistic';
-
-const App: React.FC = () => {
-  const [ipcRate, setIpcRate] = useState(4.5);
-  const [growthFactor, setGrowthFactor] = useState(2.0);
-  const [yearsToProject, setYearsToProject] = useState(10);
-  const [viewMode, setViewMode] = useState<'value' | 'percent'>('value');
-  const [timeGranularity, setTimeGranularity] = useState<'monthly' | 'yearly'>('yearly');
-  const [selectedScenario, setSelectedScenario] = useState<Scenario>('moderate');
-
-  const historicalAnnual = useMemo(() => calculateAnnualAggregates(), []);
-  
-  const { annual: projectionsAnnual, monthly: projectionsMonthly } = useMemo(() => 
-    generateProjections(ipcRate, growthFactor, yearsToProject), 
-    [ipcRate, growthFactor, yearsToProject]
-  );
-
-  const avgYield = useMemo(() => {
-    const total2025 = historicalAnnual[2025] || 0;
-    return total2025 / INITIAL_INVESTMENT;
-  }, [historicalAnnual]);
-
-  const cumulativeRevenueFrom2026 = useMemo(() => {
-    return projectionsAnnual
-      .filter(p => p.year !== "2025")
-      .reduce((acc, p) => acc + p[selectedScenario], 0);
-  }, [projectionsAnnual, selectedScenario]);
-
-  const cumulativeYieldFrom2026 = useMemo(() => {
-    return cumulativeRevenueFrom2026 / INITIAL_INVESTMENT;
-  }, [cumulativeRevenueFrom2026]);
-
-  const chartData = useMemo(() => {
-    if (timeGranularity === 'yearly') {
-      const history = Object.entries(historicalAnnual).map(([year, val]) => ({
-        label: year,
-        actual: val,
-        pessimistic: year === "2025" ? val : null,
-        moderate: year === "2025" ? val : null,
-        optimistic: year === "2025" ? val : null
-      }));
-      
-      const future = projectionsAnnual.filter(p => p.year !== "2025").map(p => ({
-        label: p.year,
-        actual: null,
-        pessimistic: p.pessimistic,
-        moderate: p.moderate,
-        optimistic: p.optimistic
-      }));
-      
-      return [...history, ...future];
-    } else {
-      const history = HISTORICAL_DATA.map(d => ({
-        label: d.date,
-        actual: d.value,
-        pessimistic: d.date === '2025-12' ? d.value : null,
-        moderate: d.date === '2025-12' ? d.value : null,
-        optimistic: d.date === '2025-12' ? d.value : null
-      }));
-      
-      const future = projectionsMonthly.map(p => ({
-        label: p.date,
-        actual: null,
-        pessimistic: p.pessimistic,
-        moderate: p.moderate,
-        optimistic: p.optimistic
-      }));
-      
-      return [...history, ...future];
-    }
-  }, [historicalAnnual, projectionsAnnual, projectionsMonthly, timeGranularity]);
-
-  const scenarioLabels: Record<Scenario, string> = {
-    pessimistic: 'Escenario Pesimista',
-    moderate: 'Escenario Moderado',
-    optimistic: 'Escenario Optimista'
-  };
-
-  return (
-    <div className="min-h-screen bg-slate-50 font-sans text-slate-900">
-      {/* Cabecera */}
-      <header className="bg-white border-b border-slate-200 sticky top-0 z-10">
-        <div className="max-w-7xl mx-auto px-4 h-16 flex items-center justify-between">
-          <div className="flex items-center gap-2">
-            <div className="bg-indigo-600 p-2 rounded-lg">
-              <Hotel className="text-white w-6 h-6" />
-            </div>
-            <div>
-              <h1 className="text-xl font-bold tracking-tight">Análisis de Inversión HOTEL NAO CARTAGENA</h1>
-              <p className="text-xs text-slate-500 font-medium italic">Proyecciones analizadas bajo <span className="font-bold text-indigo-600">{scenarioLabels[selectedScenario]}</span></p>
-            </div>
-          </div>
-          <div className="flex items-center gap-4">
-             <div className="hidden md:flex flex-col items-end">
-                <span className="text-xs text-slate-400 font-bold uppercase tracking-tight">Inversión Inicial</span>
-                <span className="text-sm font-bold text-indigo-600">{formatCurrency(INITIAL_INVESTMENT)}</span>
-             </div>
-          </div>
-        </div>
-      </header>
-
-      <main className="max-w-7xl mx-auto px-4 py-8">
-        
-        {/* Sección KPI */}
-        <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-4 gap-4 mb-8">
-          <SummaryCard 
-            title="Ingresos Reales (2025)" 
-            value={formatCurrency(historicalAnnual[2025] || 0)} 
-            subtitle="Cierre último año histórico"
-            icon={<DollarSign className="w-5 h-5" />}
-            trend="up"
-          />
-          <SummaryCard 
-            title="Rendimiento Actual" 
-            value={formatPercentage(avgYield)} 
-            subtitle="ROI actual vs Inversión"
-            icon={<Percent className="w-5 h-5" />}
-          />
-          <SummaryCard 
-            title={`Proyección Final (${2025 + yearsToProject})`} 
-            value={formatCurrency(projectionsAnnual[projectionsAnnual.length - 1]?.[selectedScenario] || 0)} 
-            subtitle={scenarioLabels[selectedScenario]}
-            icon={<TrendingUp className="w-5 h-5" />}
-            trend="up"
-          />
-          <SummaryCard 
-            title={`Total Acumulado (2026-${2025 + yearsToProject})`} 
-            value={formatCurrency(cumulativeRevenueFrom2026)} 
-            subtitle={`${scenarioLabels[selectedScenario]} (Rent: ${formatPercentage(cumulativeYieldFrom2026)})`}
-            icon={<Coins className="w-5 h-5" />}
-          />
-        </div>
-
-        <div className="grid grid-cols-1 lg:grid-cols-3 gap-8">
-          
-          {/* Panel de Controles */}
-          <div className="lg:col-span-1 space-y-6">
-            <section className="bg-white p-6 rounded-xl border border-slate-200 shadow-sm">
-              <div className="flex items-center gap-2 mb-6 text-slate-800">
-                <Settings2 className="w-5 h-5 text-indigo-500" />
-                <h2 className="font-bold uppercase text-xs tracking-widest text-slate-400">Panel de Control</h2>
-              </div>
-              
-              <div className="space-y-6">
-                {/* Selector de Escenario */}
-                <div>
-                  <label className="text-xs font-bold text-slate-500 uppercase block mb-3">Modelado de Escenario Principal</label>
-                  <div className="grid grid-cols-1 gap-2">
-                    <button 
-                      onClick={() => setSelectedScenario('pessimistic')}
-                      className={`flex items-center gap-3 px-4 py-3 rounded-xl border transition-all text-sm font-bold ${selectedScenario === 'pessimistic' ? 'bg-rose-50 border-rose-200 text-rose-700 shadow-sm' : 'bg-white border-slate-100 text-slate-500 hover:bg-slate-50'}`}
-                    >
-                      <ShieldAlert className={`w-4 h-4 ${selectedScenario === 'pessimistic' ? 'text-rose-500' : 'text-slate-300'}`} />
-                      Pesimista
-                    </button>
-                    <button 
-                      onClick={() => setSelectedScenario('moderate')}
-                      className={`flex items-center gap-3 px-4 py-3 rounded-xl border transition-all text-sm font-bold ${selectedScenario === 'moderate' ? 'bg-indigo-50 border-indigo-200 text-indigo-700 shadow-sm' : 'bg-white border-slate-100 text-slate-500 hover:bg-slate-50'}`}
-                    >
-                      <CheckCircle2 className={`w-4 h-4 ${selectedScenario === 'moderate' ? 'text-indigo-500' : 'text-slate-300'}`} />
-                      Moderado
-                    </button>
-                    <button 
-                      onClick={() => setSelectedScenario('optimistic')}
-                      className={`flex items-center gap-3 px-4 py-3 rounded-xl border transition-all text-sm font-bold ${selectedScenario === 'optimistic' ? 'bg-emerald-50 border-emerald-200 text-emerald-700 shadow-sm' : 'bg-white border-slate-100 text-slate-500 hover:bg-slate-50'}`}
-                    >
-                      <Zap className={`w-4 h-4 ${selectedScenario === 'optimistic' ? 'text-emerald-500' : 'text-slate-300'}`} />
-                      Optimista
-                    </button>
-                  </div>
-                  <p className="text-[10px] text-slate-400 mt-2 font-medium">Este ajuste afecta los totales de las tarjetas superiores.</p>
-                </div>
-
-                <div className="pt-4 border-t border-slate-100">
-                  <div className="flex justify-between mb-2">
-                    <label className="text-sm font-semibold text-slate-700">IPC Anual Esperado</label>
-                    <span className="text-sm font-bold text-indigo-600">{ipcRate}%</span>
-                  </div>
-                  <input 
-                    type="range" min="0" max="15" step="0.1"
-                    value={ipcRate} 
-                    onChange={(e) => setIpcRate(parseFloat(e.target.value))}
-                    className="w-full h-2 bg-slate-100 rounded-lg appearance-none cursor-pointer accent-indigo-600"
-                  />
-                </div>
-
-                <div>
-                  <div className="flex justify-between mb-2">
-                    <label className="text-sm font-semibold text-slate-700">Crecimiento Orgánico</label>
-                    <span className="text-sm font-bold text-indigo-600">{growthFactor}%</span>
-                  </div>
-                  <input 
-                    type="range" min="-5" max="10" step="0.5"
-                    value={growthFactor} 
-                    onChange={(e) => setGrowthFactor(parseFloat(e.target.value))}
-                    className="w-full h-2 bg-slate-100 rounded-lg appearance-none cursor-pointer accent-indigo-600"
-                  />
-                </div>
-
-                <div>
-                  <div className="flex justify-between mb-2">
-                    <label className="text-sm font-semibold text-slate-700">Años de Proyección</label>
-                    <span className="text-sm font-bold text-indigo-600">{yearsToProject} años</span>
-                  </div>
-                  <input 
-                    type="range" min="1" max="25" step="1"
-                    value={yearsToProject} 
-                    onChange={(e) => setYearsToProject(parseInt(e.target.value))}
-                    className="w-full h-2 bg-slate-100 rounded-lg appearance-none cursor-pointer accent-indigo-600"
-                  />
-                </div>
-
-                <div className="pt-4 border-t border-slate-100">
-                  <div className="flex flex-col gap-4">
-                    <div className="flex items-center justify-between">
-                      <label className="text-xs font-bold text-slate-500 uppercase">Unidad de medida</label>
-                      <div className="flex bg-slate-100 p-1 rounded-lg">
-                        <button 
-                          onClick={() => setViewMode('value')}
-                          className={`px-3 py-1 text-xs rounded-md transition-all font-bold ${viewMode === 'value' ? 'bg-white shadow-sm text-indigo-600' : 'text-slate-500'}`}
-                        >
-                          $ COP
-                        </button>
-                        <button 
-                          onClick={() => setViewMode('percent')}
-                          className={`px-3 py-1 text-xs rounded-md transition-all font-bold ${viewMode === 'percent' ? 'bg-white shadow-sm text-indigo-600' : 'text-slate-500'}`}
-                        >
-                          % ROI
-                        </button>
-                      </div>
-                    </div>
-
-                    <div className="flex items-center justify-between">
-                      <label className="text-xs font-bold text-slate-500 uppercase">Frecuencia Visual</label>
-                      <div className="flex bg-slate-100 p-1 rounded-lg">
-                        <button 
-                          onClick={() => setTimeGranularity('yearly')}
-                          className={`px-3 py-1 text-xs rounded-md transition-all font-bold ${timeGranularity === 'yearly' ? 'bg-white shadow-sm text-indigo-600' : 'text-slate-500'}`}
-                        >
-                          Anual
-                        </button>
-                        <button 
-                          onClick={() => setTimeGranularity('monthly')}
-                          className={`px-3 py-1 text-xs rounded-md transition-all font-bold ${timeGranularity === 'monthly' ? 'bg-white shadow-sm text-indigo-600' : 'text-slate-500'}`}
-                        >
-                          Mensual
-                        </button>
-                      </div>
-                    </div>
-                  </div>
-                </div>
-              </div>
-            </section>
-          </div>
-
-          {/* Área de Gráficos */}
-          <div className="lg:col-span-2 space-y-8">
-            <div className="bg-white p-6 rounded-xl border border-slate-200 shadow-sm">
-              <div className="flex flex-col md:flex-row md:items-center justify-between gap-4 mb-8">
-                <div>
-                  <h2 className="text-lg font-bold text-slate-800">Proyección de rentabilidad</h2>
-                  <p className="text-sm text-slate-500">
-                    Historial (2021-2025) vs Escenarios Proyectados (2026+)
-                  </p>
-                </div>
-                <div className="flex flex-wrap gap-2">
-                  <div className="flex items-center gap-1.5 text-[10px] font-bold text-slate-500 bg-slate-50 px-2 py-1 rounded">
-                    <div className="w-2 h-2 bg-indigo-600 rounded-full"></div> Real
-                  </div>
-                  <div className={`flex items-center gap-1.5 text-[10px] font-bold px-2 py-1 rounded transition-all ${selectedScenario === 'moderate' ? 'bg-emerald-100 text-emerald-700 scale-105' : 'bg-slate-50 text-slate-500'}`}>
-                    <div className="w-2 h-2 bg-emerald-500 rounded-full"></div> Moderado
-                  </div>
-                  <div className={`flex items-center gap-1.5 text-[10px] font-bold px-2 py-1 rounded transition-all ${selectedScenario === 'optimistic' ? 'bg-amber-100 text-amber-700 scale-105' : 'bg-slate-50 text-slate-500'}`}>
-                    <div className="w-2 h-2 bg-amber-500 rounded-full"></div> Optimista
-                  </div>
-                  <div className={`flex items-center gap-1.5 text-[10px] font-bold px-2 py-1 rounded transition-all ${selectedScenario === 'pessimistic' ? 'bg-rose-100 text-rose-700 scale-105' : 'bg-slate-50 text-slate-500'}`}>
-                    <div className="w-2 h-2 bg-rose-500 rounded-full"></div> Pesimista
-                  </div>
-                </div>
-              </div>
-
-              <div className="h-[450px] w-full">
-                <ResponsiveContainer width="100%" height="100%">
-                  <AreaChart data={chartData} margin={{ top: 10, right: 10, left: 10, bottom: 20 }}>
-                    <defs>
-                      <linearGradient id="colorActual" x1="0" y1="0" x2="0" y2="1">
-                        <stop offset="5%" stopColor="#4f46e5" stopOpacity={0.2}/>
-                        <stop offset="95%" stopColor="#4f46e5" stopOpacity={0}/>
-                      </linearGradient>
-                      <linearGradient id="colorOpt" x1="0" y1="0" x2="0" y2="1">
-                        <stop offset="5%" stopColor="#f59e0b" stopOpacity={0.1}/>
-                        <stop offset="95%" stopColor="#f59e0b" stopOpacity={0}/>
-                      </linearGradient>
-                    </defs>
-                    <CartesianGrid strokeDasharray="3 3" vertical={false} stroke="#f1f5f9" />
-                    <XAxis 
-                      dataKey="label" 
-                      axisLine={false} 
-                      tickLine={false} 
-                      tick={{fontSize: 9, fill: '#64748b', fontWeight: 600}}
-                      interval={timeGranularity === 'monthly' ? 8 : 0}
-                      padding={{ left: 10, right: 10 }}
-                    />
-                    <YAxis 
-                      axisLine={false} 
-                      tickLine={false} 
-                      tickFormatter={(val) => `$${(val / 1000000).toFixed(0)}M`}
-                      tick={{fontSize: 10, fill: '#64748b', fontWeight: 500}}
-                    />
-                    <Tooltip 
-                      contentStyle={{borderRadius: '12px', border: 'none', boxShadow: '0 15px 30px -5px rgb(0 0 0 / 0.15)', padding: '12px'}}
-                      formatter={(val: number) => [viewMode === 'value' ? formatCurrency(val) : formatPercentage(val / INITIAL_INVESTMENT), 'Valor']}
-                      labelStyle={{ fontWeight: 'bold', marginBottom: '8px', color: '#1e293b' }}
-                    />
-                    <Area 
-                      type="monotone" 
-                      dataKey="actual" 
-                      stroke="#4f46e5" 
-                      strokeWidth={4} 
-                      fillOpacity={1} 
-                      fill="url(#colorActual)" 
-                      connectNulls={true}
-                    />
-                    <Line 
-                      type="monotone" 
-                      dataKey="pessimistic" 
-                      stroke="#ef4444" 
-                      strokeWidth={selectedScenario === 'pessimistic' ? 4 : 2} 
-                      strokeDasharray={selectedScenario === 'pessimistic' ? "0" : "4 4"} 
-                      dot={false} 
-                      connectNulls={true}
-                    />
-                    <Area 
-                      type="monotone" 
-                      dataKey="moderate" 
-                      stroke="#10b981" 
-                      strokeWidth={selectedScenario === 'moderate' ? 5 : 3} 
-                      fillOpacity={0} 
-                      dot={false} 
-                      connectNulls={true}
-                    />
-                    <Area 
-                      type="monotone" 
-                      dataKey="optimistic" 
-                      stroke="#f59e0b" 
-                      strokeWidth={selectedScenario === 'optimistic' ? 4 : 2} 
-                      fillOpacity={0.5} 
-                      fill="url(#colorOpt)" 
-                      dot={false} 
-                      connectNulls={true}
-                    />
-                  </AreaChart>
-                </ResponsiveContainer>
-              </div>
-            </div>
-
-            <div className="bg-white p-6 rounded-xl border border-slate-200 shadow-sm overflow-hidden">
-              <div className="flex items-center justify-between mb-6">
-                <div className="flex items-center gap-2">
-                  <BarChart3 className="w-5 h-5 text-indigo-500" />
-                  <h2 className="text-lg font-bold text-slate-800">Tabla Detallada de Rentabilidad</h2>
-                </div>
-                <div className="text-[10px] font-bold text-slate-400 uppercase tracking-widest bg-slate-50 px-3 py-1 rounded-full">
-                  Cifras en {viewMode === 'value' ? 'Pesos (COP)' : 'Rendimiento %'}
-                </div>
-              </div>
-              <div className="overflow-x-auto max-h-[500px] overflow-y-auto custom-scrollbar">
-                <table className="w-full text-left">
-                  <thead className="sticky top-0 bg-white z-10">
-                    <tr className="border-b border-slate-100 bg-slate-50">
-                      <th className="py-3 px-4 font-bold text-slate-600 text-xs uppercase tracking-tighter">{timeGranularity === 'yearly' ? 'Año' : 'Período'}</th>
-                      <th className={`py-3 px-4 font-bold text-xs uppercase tracking-tighter ${selectedScenario === 'pessimistic' ? 'text-indigo-600 bg-indigo-50' : 'text-slate-600'}`}>Pesimista</th>
-                      <th className={`py-3 px-4 font-bold text-xs uppercase tracking-tighter ${selectedScenario === 'moderate' ? 'text-indigo-600 bg-indigo-50' : 'text-slate-600'}`}>Moderado</th>
-                      <th className={`py-3 px-4 font-bold text-xs uppercase tracking-tighter ${selectedScenario === 'optimistic' ? 'text-indigo-600 bg-indigo-50' : 'text-slate-600'}`}>Optimista</th>
-                    </tr>
-                  </thead>
-                  <tbody className="divide-y divide-slate-50">
-                    {(timeGranularity === 'yearly' ? projectionsAnnual : projectionsMonthly).map((p: any) => (
-                      <tr key={p.year || p.date} className="hover:bg-indigo-50/30 transition-colors group">
-                        <td className="py-4 px-4 font-bold text-slate-700 text-sm group-hover:text-indigo-600">{p.year || p.date}</td>
-                        <td className={`py-4 px-4 text-xs font-semibold ${selectedScenario === 'pessimistic' ? 'bg-indigo-50/30 font-bold text-rose-700' : 'text-rose-600 italic'}`}>
-                          {viewMode === 'value' ? formatCurrency(p.pessimistic) : formatPercentage(p.pessimistic / (INITIAL_INVESTMENT / (timeGranularity === 'yearly' ? 1 : 12)))}
-                        </td>
-                        <td className={`py-4 px-4 text-xs font-bold ${selectedScenario === 'moderate' ? 'bg-indigo-50/30 text-indigo-700 text-sm' : 'text-slate-600'}`}>
-                          {viewMode === 'value' ? formatCurrency(p.moderate) : formatPercentage(p.moderate / (INITIAL_INVESTMENT / (timeGranularity === 'yearly' ? 1 : 12)))}
-                        </td>
-                        <td className={`py-4 px-4 text-xs font-extrabold ${selectedScenario === 'optimistic' ? 'bg-indigo-50/30 text-emerald-700' : 'text-emerald-600'}`}>
-                          {viewMode === 'value' ? formatCurrency(p.optimistic) : formatPercentage(p.optimistic / (INITIAL_INVESTMENT / (timeGranularity === 'yearly' ? 1 : 12)))}
-                        </td>
-                      </tr>
-                    ))}
-                  </tbody>
-                </table>
-              </div>
-            </div>
-          </div>
-        </div>
-      </main>
-
-      {/* Footer */}
-      <footer className="bg-white border-t border-slate-200 mt-12 py-10">
-        <div className="max-w-7xl mx-auto px-4 flex flex-col md:flex-row justify-between items-center gap-6 text-slate-400 text-xs font-medium">
-          <p>© 2025 Dashboard Hotelero de Alto Rendimiento. Todos los derechos reservados.</p>
-          <div className="flex gap-8">
-            <span className="flex items-center gap-1.5 text-indigo-500 font-bold"><Activity className="w-4 h-4" /> Datos de Alta Precisión</span>
-            <a href="#" className="hover:text-indigo-600 transition-colors uppercase tracking-widest">Documentación</a>
-          </div>
-        </div>
-      </footer>
-    </div>
-  );
-};
-
-export default App;
+import streamlit as st
+
+from components.summary_card import summary_card
+from constants import INITIAL_INVESTMENT
+from utils.cache import cache_stats
+from utils.formatting import format_currency, format_horizon, format_payback, format_percentage, format_year_block
+from utils.metrics import REGISTRY, STARTUP, Rerun
+from utils.snapshot import (
+    DEFAULT_DISCOUNT_RATE,
+    DEFAULT_GROWTH_FACTOR,
+    DEFAULT_IPC_RATE,
+    DEFAULT_VIEW,
+    DEFAULT_YEARS,
+    startup_snapshot,
+)
+
+SCENARIO_LABELS = {
+    "pessimistic": "Escenario Pesimista",
+    "moderate": "Escenario Moderado",
+    "optimistic": "Escenario Optimista",
+}
+
+rerun = Rerun()
+st.set_page_config(page_title="Hotel NAO Cartagena", page_icon="🏨", layout="wide")
+
+# Panel de Control
+with st.sidebar:
+    st.caption("PANEL DE CONTROL")
+    selected_scenario = st.radio(
+        "Modelado de Escenario Principal",
+        options=list(SCENARIO_LABELS),
+        index=1,
+        format_func=lambda s: SCENARIO_LABELS[s].replace("Escenario ", ""),
+        help="Este ajuste afecta los totales de las tarjetas superiores.",
+    )
+    ipc_rate = st.slider("IPC Anual Esperado (%)", min_value=0.0, max_value=15.0, value=DEFAULT_IPC_RATE, step=0.1)
+    growth_factor = st.slider("Crecimiento Orgánico (%)", min_value=-5.0, max_value=10.0, value=DEFAULT_GROWTH_FACTOR, step=0.5)
+    years_to_project = st.slider("Años de Proyección", min_value=1, max_value=25, value=DEFAULT_YEARS, step=1)
+    discount_rate = st.number_input(
+        "Tasa de descuento anual (%)", min_value=0.0, max_value=50.0, value=DEFAULT_DISCOUNT_RATE, step=0.5,
+        help="Tasa con la que se descuentan los ingresos mensuales para el VPN.",
+    )
+    view_mode = st.radio(
+        "Unidad de medida", options=["value", "percent"], horizontal=True,
+        format_func=lambda v: "$ COP" if v == "value" else "% ROI",
+    )
+    time_granularity = st.radio(
+        "Frecuencia Visual", options=["yearly", "monthly"], horizontal=True,
+        format_func=lambda v: "Anual" if v == "yearly" else "Mensual",
+    )
+    stochastic = st.toggle("Modo estocástico (Monte Carlo)")
+    if stochastic:
+        ipc_std = st.number_input("Desviación IPC (pp)", min_value=0.0, max_value=10.0, value=1.5, step=0.1)
+        growth_std = st.number_input("Desviación crecimiento (pp)", min_value=0.0, max_value=10.0, value=2.0, step=0.1)
+        paths = st.select_slider("Trayectorias", options=[1_000, 10_000, 50_000, 100_000], value=50_000)
+
+# Claves normalizadas para que las sesiones con los mismos parámetros compartan caché.
+ipc_rate, growth_factor, discount_rate = round(ipc_rate, 1), round(growth_factor, 1), round(discount_rate, 1)
+
+key = (ipc_rate, growth_factor, years_to_project)
+
+# La vista por defecto sale de la instantánea de arranque: la cabecera y las
+# tarjetas se pintan sin importar NumPy ni pandas. ``startup_snapshot`` compara
+# en cada ejecución su ancla con la del histórico vigente.
+snapshot = None
+if key == DEFAULT_VIEW:
+    with rerun.span("snapshot"):
+        snapshot = startup_snapshot()
+
+if snapshot is None:
+    from utils import derived
+    from utils.history import history_store
+
+    store = history_store()
+    with rerun.span("historical_annual"):
+        closed_year_revenue = derived.historical_annual().get(store.latest_closed_year, 0.0)
+    closed_year, anchor_year, anchor_month = store.latest_closed_year, store.anchor.year, store.anchor.month
+    with rerun.span("avg_yield"):
+        avg_yield = store.latest_year_yield(INITIAL_INVESTMENT)
+    with rerun.span("cumulative_revenue", (*key, selected_scenario)):
+        cumulative_revenue = derived.cumulative_revenue(*key, selected_scenario)
+    with rerun.span("final_revenue", (*key, selected_scenario)):
+        final_revenue = derived.final_revenue(*key, selected_scenario)
+else:
+    closed_year = snapshot.closed_year
+    anchor_year, anchor_month = map(int, snapshot.anchor.split("-"))
+    closed_year_revenue, avg_yield = snapshot.closed_year_revenue, snapshot.current_yield
+    cumulative_revenue = snapshot.cumulative_revenue[selected_scenario]
+    final_revenue = snapshot.final_revenue[selected_scenario]
+# Los bloques anuales terminan en el mes del ancla; solo son años calendario si es diciembre.
+final_year = format_year_block(anchor_year, anchor_month, years_to_project)
+horizon = format_horizon(anchor_year, anchor_month, years_to_project)
+cumulative_yield = cumulative_revenue / INITIAL_INVESTMENT
+
+if snapshot is not None and discount_rate == DEFAULT_DISCOUNT_RATE:
+    npv = snapshot.npv[selected_scenario]
+    irr = snapshot.irr[selected_scenario]
+    payback = snapshot.payback[selected_scenario]
+else:
+    from utils import derived
+
+    with rerun.span("returns", (*key, discount_rate)):
+        metrics = derived.returns(*key, discount_rate)
+    npv, irr, payback = (float(metric[list(SCENARIO_LABELS).index(selected_scenario)]) for metric in metrics)
+
+bands = return_bands = None
+if stochastic:
+    from utils import derived
+
+    with rerun.span("fan_bands", (*key, ipc_std, growth_std, paths)):
+        bands = derived.fan_bands(*key, ipc_std, growth_std, paths)
+    with rerun.span("return_bands", (*key, ipc_std, growth_std, paths, discount_rate)):
+        return_bands = derived.return_bands(*key, ipc_std, growth_std, paths, discount_rate)
+
+# Cabecera
+header, investment = st.columns([4, 1])
+header.markdown("## 🏨 Análisis de Inversión HOTEL NAO CARTAGENA")
+header.caption(f"Proyecciones analizadas bajo **{SCENARIO_LABELS[selected_scenario]}**")
+investment.metric("Inversión Inicial", format_currency(INITIAL_INVESTMENT))
+
+# Sección KPI
+kpis = st.columns(4)
+with kpis[0]:
+    summary_card(
+        f"Ingresos Reales ({closed_year})", format_currency(closed_year_revenue),
+        "Cierre último año histórico", "💲", trend="up",
+    )
+with kpis[1]:
+    summary_card("Rendimiento Actual", format_percentage(avg_yield), "ROI actual vs Inversión", "％")
+if bands is None:
+    with kpis[2]:
+        summary_card(
+            f"Proyección Final ({final_year})", format_currency(final_revenue),
+            SCENARIO_LABELS[selected_scenario], "📈", trend="up",
+        )
+    with kpis[3]:
+        summary_card(
+            f"Total Acumulado ({horizon})", format_currency(cumulative_revenue),
+            f"{SCENARIO_LABELS[selected_scenario]} (Rent: {format_percentage(cumulative_yield)})", "🪙",
+        )
+else:
+    final_band = bands.annual.iloc[-1]
+    cumulative_band = bands.cumulative.iloc[-1]
+    with kpis[2]:
+        summary_card(
+            f"Proyección Final P50 ({final_year})", format_currency(final_band["p50"]),
+            f"P5 {format_currency(final_band['p5'])} · P95 {format_currency(final_band['p95'])}", "📈", trend="up",
+        )
+    with kpis[3]:
+        summary_card(
+            f"Total Acumulado P50 ({horizon})", format_currency(cumulative_band["p50"]),
+            f"Rent: {format_percentage(cumulative_band['p5'] / INITIAL_INVESTMENT)}"
+            f" – {format_percentage(cumulative_band['p95'] / INITIAL_INVESTMENT)} (P5–P95)", "🪙",
+        )
+
+# Indicadores con valor del dinero en el tiempo
+returns_cards = st.columns(3)
+if return_bands is None:
+    with returns_cards[0]:
+        summary_card(
+            f"VPN al {discount_rate:.1f}% ({horizon})", format_currency(npv), SCENARIO_LABELS[selected_scenario], "🏦",
+            trend="up" if npv >= 0 else "down",
+        )
+    with returns_cards[1]:
+        summary_card(f"TIR ({horizon})", format_percentage(irr), "Tasa interna de retorno anual", "🎯")
+    with returns_cards[2]:
+        summary_card("Recuperación de la Inversión", format_payback(payback), "Ingresos acumulados ≥ inversión", "⏳")
+else:
+    npv_band, irr_band, payback_band = return_bands["npv"], return_bands["irr"], return_bands["payback"]
+    with returns_cards[0]:
+        summary_card(
+            f"VPN P50 al {discount_rate:.1f}% ({horizon})", format_currency(npv_band["p50"]),
+            f"P5 {format_currency(npv_band['p5'])} · P95 {format_currency(npv_band['p95'])}", "🏦",
+            trend="up" if npv_band["p50"] >= 0 else "down",
+        )
+    with returns_cards[1]:
+        summary_card(
+            f"TIR P50 ({horizon})", format_percentage(irr_band["p50"]),
+            f"{format_percentage(irr_band['p5'])} – {format_percentage(irr_band['p95'])} (P5–P95)", "🎯",
+        )
+    with returns_cards[2]:
+        summary_card(
+            "Recuperación P50", format_payback(payback_band["p50"]),
+            f"P5 {format_payback(payback_band['p5'])} · P95 {format_payback(payback_band['p95'])}", "⏳",
+        )
+
+rerun.checkpoint("first_paint")
+
+# Desde aquí se necesitan NumPy y pandas.
+import math  # noqa: E402
+
+import pandas as pd  # noqa: E402
+
+from utils import derived  # noqa: E402
+from utils.charts import build_figure, build_irr_heatmap  # noqa: E402
+from utils.cube import GROWTH_MAX, GROWTH_MIN, GROWTH_STEP, IPC_MAX, IPC_MIN, IPC_STEP  # noqa: E402
+from utils.history import refresh_history  # noqa: E402
+from utils.store import array_store  # noqa: E402
+from utils.table import page, page_count  # noqa: E402
+
+# Si el archivo de datos trae meses nuevos, se anexan al histórico compartido y
+# la ejecución se repite para que las tarjetas de arriba usen la nueva ancla.
+if refresh_history():
+    st.rerun()
+
+# Área de Gráficos
+with rerun.span("chart_data", (*key, time_granularity)):
+    chart = derived.chart_data(*key, time_granularity)
+future_bands = None if bands is None else (bands.annual if time_granularity == "yearly" else bands.monthly)
+with rerun.span("figure", (time_granularity, selected_scenario)):
+    figure = build_figure(chart, time_granularity, selected_scenario, future_bands)
+
+st.markdown("#### Proyección de rentabilidad")
+st.caption(f"Historial ({chart['label'].iloc[0][:4]}-{closed_year}) vs Escenarios Proyectados ({horizon})")
+st.plotly_chart(figure, width="stretch")
+
+# Meta de rentabilidad (búsqueda inversa)
+st.markdown("#### 🧭 Meta de rentabilidad")
+st.caption(f"¿Qué IPC o crecimiento se necesita para llegar a la meta? {SCENARIO_LABELS[selected_scenario]} · {horizon}")
+goal = st.columns([2, 2, 2, 3])
+target = goal[0].radio(
+    "Meta", options=["cumulative_yield", "final_revenue"], key="goal_target",
+    format_func=lambda v: "Rentabilidad acumulada" if v == "cumulative_yield" else f"Ingresos {final_year}",
+)
+if target == "cumulative_yield":
+    target_value = goal[1].number_input(
+        "Rentabilidad acumulada (%)", min_value=0.0, value=500.0, step=10.0, key="goal_yield"
+    ) / 100
+    target_label = f"{format_percentage(target_value)} acumulado"
+else:
+    target_value = goal[1].number_input(
+        "Ingresos del año final (COP)", min_value=0.0, value=float(round(final_revenue * 1.2, -6)), step=1e7,
+        format="%.0f", key="goal_revenue",
+    )
+    target_label = f"{format_currency(target_value)} en {final_year}"
+solve_for = goal[2].radio(
+    "Despejar", options=["growth", "ipc"], key="goal_solve_for",
+    format_func=lambda v: "Crecimiento" if v == "growth" else "IPC",
+)
+fixed = ipc_rate if solve_for == "growth" else growth_factor
+with rerun.span("goal_seek", (target, target_value, selected_scenario, years_to_project, solve_for, fixed)):
+    required = derived.goal_seek(target, target_value, selected_scenario, years_to_project, solve_for, fixed)
+if math.isnan(required):
+    goal[3].metric("Valor requerido", "Inalcanzable", help="La meta queda fuera del intervalo de búsqueda.")
+else:
+    step, low, high = (GROWTH_STEP, GROWTH_MIN, GROWTH_MAX) if solve_for == "growth" else (IPC_STEP, IPC_MIN, IPC_MAX)
+    slider_value = math.ceil(round(required / step, 6)) * step
+    goal[3].metric(
+        f"{'Crecimiento' if solve_for == 'growth' else 'IPC'} requerido",
+        f"{required:.2f}%",
+        f"con {'IPC' if solve_for == 'growth' else 'crecimiento'} en {fixed:.1f}%",
+        delta_color="off",
+    )
+    goal[3].caption(
+        f"En el slider: {slider_value:.1f}%" if low <= slider_value <= high else "Fuera del rango de los sliders"
+    )
+
+# Mapa de TIR
+with rerun.span("irr_lattice", (years_to_project,)):
+    lattice = derived.irr_lattice(years_to_project)
+with rerun.span("iso_contour", (target, target_value, selected_scenario, years_to_project)):
+    contour = derived.iso_contour(target, target_value, selected_scenario, years_to_project)
+st.markdown("#### 🎯 TIR por IPC y crecimiento")
+st.caption(
+    f"{SCENARIO_LABELS[selected_scenario]} · horizonte {horizon} · el punto marca la combinación seleccionada"
+    " y la línea, las combinaciones que alcanzan justo la meta"
+)
+with rerun.span("irr_heatmap", (years_to_project, selected_scenario)):
+    heatmap = build_irr_heatmap(
+        lattice[:, :, list(SCENARIO_LABELS).index(selected_scenario)], ipc_rate, growth_factor,
+        contour, f"Meta: {target_label}",
+    )
+st.plotly_chart(heatmap, width="stretch")
+
+# Tabla Detallada de Rentabilidad
+with rerun.span("table", (*key, time_granularity, view_mode)):
+    if snapshot is not None and time_granularity == "yearly":
+        table = pd.DataFrame(snapshot.tables[view_mode]["data"], columns=snapshot.tables[view_mode]["columns"])
+    else:
+        table = derived.table(*key, time_granularity, view_mode)
+pages = page_count(len(table))
+
+title, page_selector = st.columns([3, 1])
+title.markdown("#### 📊 Tabla Detallada de Rentabilidad")
+title.caption(f"Cifras en {'Pesos (COP)' if view_mode == 'value' else 'Rendimiento %'}")
+page_number = page_selector.number_input(
+    f"Página (de {pages})", min_value=1, max_value=pages, value=1, step=1, disabled=pages == 1,
+)
+st.dataframe(page(table, min(page_number, pages)), hide_index=True, width="stretch")
+
+# Portafolio
+if derived.portfolio() is not None:
+    st.markdown("#### 🏢 Portafolio")
+    with rerun.span("portfolio_projection", key):
+        portfolio = derived.portfolio_projection(*key)
+    group_by = st.radio(
+        "Agrupar por", options=["property", "owner"], horizontal=True,
+        format_func=lambda v: "Propiedad" if v == "property" else "Propietario",
+    )
+    groups = portfolio.aggregate(group_by)
+    groups = groups[groups["scenario"] == selected_scenario]
+    summary = groups.groupby(group_by).agg(investment=("investment", "first"), revenue=("revenue", "sum"))
+    summary["final"] = groups.groupby(group_by)["revenue"].last()
+    summary["yield"] = summary["revenue"] / summary["investment"]
+    st.dataframe(
+        summary.reset_index().rename(columns={
+            group_by: "Propiedad" if group_by == "property" else "Propietario", "investment": "Inversión",
+            "revenue": f"Acumulado {horizon}", "final": f"Ingresos {final_year}",
+            "yield": "Rentabilidad acumulada",
+        }),
+        hide_index=True, width="stretch", height=300,
+        column_config={"Rentabilidad acumulada": st.column_config.NumberColumn(format="percent")},
+    )
+    unit_id = st.selectbox("Detalle por unidad", options=portfolio.portfolio.units["unit_id"], index=None)
+    if unit_id is not None:
+        st.dataframe(portfolio.unit(unit_id), hide_index=True, width="stretch", height=300)
+
+rerun_seconds = rerun.finish()
+
+# Panel de depuración: tramos de esta ejecución, histogramas del proceso y cachés
+with st.expander(f"Depuración · ejecución en {rerun_seconds * 1e3:.1f} ms"):
+    st.caption(
+        f"Primera pintura a los {rerun.checkpoints['first_paint'] * 1e3:.1f} ms de esta ejecución · "
+        "arranque en frío del proceso: "
+        + " · ".join(f"{phase} {seconds * 1e3:.1f} ms" for phase, seconds in STARTUP.items())
+    )
+    st.markdown("**Tramos de esta ejecución**")
+    st.dataframe(
+        [
+            {"etapa": span.stage, "clave": repr(span.key), "caché": span.cache, "ms": round(span.seconds * 1e3, 3)}
+            for span in rerun.spans
+        ],
+        hide_index=True, width="stretch",
+    )
+    st.markdown("**Acumulado del proceso**")
+    st.dataframe(
+        [
+            {"etapa": stage, "ejecuciones": calls, "ms promedio": round(seconds / calls * 1e3, 3)}
+            for stage, (calls, seconds) in REGISTRY.stage_totals().items()
+        ],
+        hide_index=True, width="stretch",
+    )
+    st.markdown("**Cachés**")
+    st.dataframe(
+        [{"caché": name, **vars(stats)} for name, stats in cache_stats().items()], hide_index=True, width="stretch"
+    )
+    st.markdown("**Almacén compartido**")
+    st.dataframe(array_store().segments(), hide_index=True, width="stretch")
+
+st.divider()
+st.caption("© 2025 Dashboard Hotelero de Alto Rendimiento. Todos los derechos reservados.")
@@ -0,0 +1,266 @@
+"""Generador de carga local: N sesiones concurrentes del dashboard sobre el almacén compartido.
+
+Cada sesión es un hilo, como en el servidor de Streamlit, que repite la
+ejecución del script (indicadores, VPN/TIR, datos y figura del gráfico, meta
+de rentabilidad, mapa de TIR con su curva y tabla) sobre vistas al azar de un
+recorrido de ``--views`` posiciones de los sliders desde la vista por defecto.
+Las sesiones se reparten entre ``--processes`` procesos de trabajo que abren
+el mismo cubo y las mismas retículas de TIR del almacén compartido de
+:mod:`utils.store`.
+
+Por cada cantidad de sesiones se arrancan procesos nuevos; cada uno recorre
+primero todas las vistas para llenar sus cachés y luego atiende sus sesiones.
+Cada nivel se corre dos veces: con el almacén compartido y, como referencia,
+como antes del almacén, con el cubo mapeado y las retículas de TIR calculadas
+en la memoria privada de cada proceso. Se reportan la latencia de las
+ejecuciones y la memoria de los procesos leída de ``/proc/self/smaps``: RSS,
+PSS (las páginas compartidas se reparten entre los procesos que las mapean),
+memoria privada, el crecimiento de la PSS mientras atienden las sesiones y la
+PSS de los segmentos mapeados del almacén. Los procesos toman cada medición a
+la vez, para que todos cuenten el mismo reparto de páginas compartidas.
+
+El crecimiento de la PSS por sesión no lo controla el almacén: cada sesión
+concurrente es un hilo con su pila y con los temporales de la ejecución en
+curso, y el asignador de memoria conserva ese pico. Se reporta junto con el de
+la referencia. Lo que sí controla el almacén es que sus segmentos se carguen
+una sola vez en la máquina: termina con código 1 si la PSS sumada de los
+segmentos con varios procesos supera en más de ``--tolerance`` (relativa) a la
+de un solo proceso. Uso, desde la raíz del repositorio::
+
+    python -m benchmarks.loadgen
+    python -m benchmarks.loadgen --sessions 1 16 64 --processes 8 --reruns 30
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Importar ``benchmarks.run`` aísla NAO_CACHE_DIR y NAO_DATA_FILE en un directorio temporal.
+from benchmarks.run import ROOT, synthetic_history
+
+MEMORY_FIELDS = ("Rss", "Pss", "Private_Clean", "Private_Dirty")
+
+
+def memory_usage() -> dict[str, float]:
+    """RSS, PSS y memoria privada del proceso en MB según ``/proc/self/smaps_rollup``."""
+    usage = {}
+    try:
+        for line in Path("/proc/self/smaps_rollup").read_text().splitlines():
+            field, _, value = line.partition(":")
+            if field in MEMORY_FIELDS:
+                usage[field] = int(value.split()[0]) / 1024
+    except OSError:
+        import resource
+
+        usage["Rss"] = usage["Pss"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    usage["Private"] = usage.pop("Private_Clean", 0.0) + usage.pop("Private_Dirty", 0.0)
+    return usage
+
+
+def store_usage(directory: Path) -> float:
+    """PSS en MB de los archivos de ``directory`` mapeados por el proceso, según ``/proc/self/smaps``."""
+    total, inside = 0, False
+    try:
+        lines = Path("/proc/self/smaps").read_text().splitlines()
+    except OSError:
+        return 0.0
+    for line in lines:
+        fields = line.split()
+        if not fields[0].endswith(":"):
+            # Cabecera de un mapeo: ``dirección permisos desplazamiento dispositivo inodo ruta``.
+            inside = len(fields) >= 6 and fields[5].startswith(str(directory))
+        elif inside and fields[0] == "Pss:":
+            total += int(fields[1])
+    return total / 1024
+
+
+def views(count: int, seed: int = 0) -> list[tuple]:
+    """``count`` vistas de un recorrido al azar de los sliders desde la vista por defecto."""
+    from utils.cube import GROWTH_MAX, GROWTH_MIN, GROWTH_STEP, IPC_MAX, IPC_MIN, IPC_STEP, MAX_YEARS
+    from utils.finance import SCENARIOS
+    from utils.snapshot import DEFAULT_VIEW
+
+    rng = random.Random(seed)
+    ipc_rate, growth_factor, years = DEFAULT_VIEW
+    result = []
+    for _ in range(count):
+        result.append((ipc_rate, growth_factor, years, rng.choice(SCENARIOS), rng.choice(("yearly", "monthly"))))
+        ipc_rate = round(min(max(ipc_rate + rng.choice((-1, 0, 1)) * IPC_STEP, IPC_MIN), IPC_MAX), 1)
+        growth_factor = round(min(max(growth_factor + rng.choice((-1, 0, 1)) * GROWTH_STEP, GROWTH_MIN), GROWTH_MAX), 1)
+        years = min(max(years + rng.choice((-1, 0, 1)), 1), MAX_YEARS)
+    return result
+
+
+def rerun(ipc_rate: float, growth_factor: float, years: int, scenario: str, granularity: str) -> float:
+    """Ejecuta lo mismo que ``app.py`` para una vista y devuelve los segundos que tardó."""
+    from utils import derived
+    from utils.charts import build_figure, build_irr_heatmap
+    from utils.finance import SCENARIOS
+    from utils.snapshot import DEFAULT_DISCOUNT_RATE
+
+    key = (ipc_rate, growth_factor, years)
+    start = time.perf_counter()
+    derived.cumulative_revenue(*key, scenario)
+    derived.final_revenue(*key, scenario)
+    derived.returns(*key, DEFAULT_DISCOUNT_RATE)
+    build_figure(derived.chart_data(*key, granularity), granularity, scenario)
+    derived.goal_seek("cumulative_yield", 5.0, scenario, years, "growth", ipc_rate)
+    lattice = derived.irr_lattice(years)
+    contour = derived.iso_contour("cumulative_yield", 5.0, scenario, years)
+    build_irr_heatmap(lattice[:, :, SCENARIOS.index(scenario)], ipc_rate, growth_factor, contour)
+    derived.table(*key, granularity, "value")
+    return time.perf_counter() - start
+
+
+def session(pool: list[tuple], reruns: int, seed: int, latencies: list[float], think: float) -> None:
+    """Una sesión que pasa ``reruns`` veces por vistas al azar de ``pool``."""
+    rng = random.Random(seed)
+    for _ in range(reruns):
+        latencies.append(rerun(*rng.choice(pool)))
+        time.sleep(think)
+
+
+def worker(
+    sessions: int, reruns: int, seed: int, think: float, pool: list[tuple], shared: bool, barrier
+) -> dict:
+    """Proceso de trabajo: recorre una vez todas las vistas y luego atiende ``sessions`` a la vez.
+
+    El primer recorrido llena las cachés del proceso, así que el crecimiento
+    medido después es el costo propio de las sesiones y no el de las cachés.
+    Con ``shared=False`` cada proceso calcula sus retículas de TIR en memoria
+    privada, como antes del almacén. Cada medición se toma tras ``barrier``, con todos
+    los procesos del nivel vivos.
+    """
+    from utils.cache import cache_stats
+    from utils.derived import IRR_LATTICE_SEGMENT
+    from utils.store import STORE_DIR, ArrayStore, set_array_store
+
+    if not shared:
+        set_array_store(ArrayStore(STORE_DIR, private=(IRR_LATTICE_SEGMENT,)))
+    for view in pool:
+        rerun(*view)
+    barrier.wait()
+    before = memory_usage()
+    barrier.wait()
+    latencies: list[float] = []
+    threads = [
+        threading.Thread(target=session, args=(pool, reruns, seed * 1000 + i, latencies, think), daemon=True)
+        for i in range(sessions)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    barrier.wait()
+    after, store = memory_usage(), store_usage(STORE_DIR)
+    barrier.wait()
+    return {
+        "before": before,
+        "after": after,
+        "store": store,
+        "latencies": latencies,
+        "cached": sum(stats.size for stats in cache_stats().values()),
+    }
+
+
+def run_level(sessions: int, processes: int, reruns: int, think: float, pool: list[tuple], shared: bool) -> dict:
+    """Reparte ``sessions`` entre ``processes`` procesos nuevos y agrega sus resultados."""
+    shares = [sessions // processes + (i < sessions % processes) for i in range(processes)]
+    # ``fork``: los procesos heredan el entorno aislado sin volver a importar este módulo.
+    context = multiprocessing.get_context("fork")
+    with context.Manager() as manager, ProcessPoolExecutor(len(shares), mp_context=context) as executor:
+        barrier = manager.Barrier(len(shares))
+        futures = [
+            executor.submit(worker, share, reruns, seed, think, pool, shared, barrier)
+            for seed, share in enumerate(shares, start=1)
+        ]
+        results = [future.result() for future in futures]
+
+    latencies = sorted(latency for result in results for latency in result["latencies"])
+    row = {"store": "compartido" if shared else "referencia", "sessions": sessions, "processes": processes}
+    row["reruns"] = len(latencies)
+    row["p50_ms"] = latencies[len(latencies) // 2] * 1e3
+    row["p95_ms"] = latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)] * 1e3
+    for field in ("Rss", "Pss", "Private"):
+        row[field] = sum(result["after"][field] for result in results)
+    row["growth"] = sum(result["after"]["Pss"] - result["before"]["Pss"] for result in results)
+    row["store_pss"] = sum(result["store"] for result in results)
+    row["cached"] = sum(result["cached"] for result in results)
+    return row
+
+
+def per_session_growth(rows: list[dict]) -> float | None:
+    """Crecimiento de la PSS por cada sesión adicional entre el primer y el último nivel."""
+    if len(rows) < 2 or rows[-1]["sessions"] <= rows[0]["sessions"]:
+        return None
+    return (rows[-1]["growth"] - rows[0]["growth"]) / (rows[-1]["sessions"] - rows[0]["sessions"])
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--processes", type=int, default=4, help="procesos como máximo en cada nivel")
+    parser.add_argument("--reruns", type=int, default=20, help="ejecuciones del script por sesión")
+    parser.add_argument("--views", type=int, default=64, help="vistas distintas que recorren las sesiones")
+    parser.add_argument("--think", type=float, default=0.01, help="segundos entre ejecuciones de una sesión")
+    parser.add_argument("--history-years", type=int, default=10)
+    parser.add_argument(
+        "--tolerance", type=float, default=0.1, help="aumento relativo tolerado de la PSS de los segmentos"
+    )
+    args = parser.parse_args(argv)
+
+    history = synthetic_history(args.history_years)
+    Path(os.environ["NAO_DATA_FILE"]).write_text(json.dumps({"initial_investment": 4.5e8, "historical_data": history}))
+    # El cubo se escribe una vez antes de arrancar los procesos, como en un despliegue.
+    subprocess.run([sys.executable, "-m", "utils.cube"], cwd=ROOT, check=True, stdout=subprocess.DEVNULL)
+
+    from utils.derived import IRR_LATTICE_SEGMENT
+    from utils.store import STORE_DIR
+
+    pool = views(args.views)
+    header = f"{'almacén':>10} {'sesiones':>8} {'procesos':>8} {'ejec.':>6} {'p50 ms':>8} {'p95 ms':>8}"
+    header += f" {'RSS MB':>8} {'PSS MB':>8} {'privada MB':>10} {'Δ PSS MB':>9} {'segmentos MB':>12} {'en caché':>8}"
+    print(header)
+    rows: dict[bool, list[dict]] = {True: [], False: []}
+    for sessions in args.sessions:
+        for shared in (True, False):
+            # Cada nivel parte sin retículas de TIR en el almacén, así que las calcula
+            # una vez en el modo compartido y una vez por proceso en la referencia.
+            for path in STORE_DIR.glob(f"{IRR_LATTICE_SEGMENT}_*.npy"):
+                path.unlink()
+            row = run_level(sessions, min(args.processes, sessions), args.reruns, args.think, pool, shared)
+            rows[shared].append(row)
+            print(
+                f"{row['store']:>10} {row['sessions']:>8} {row['processes']:>8} {row['reruns']:>6}"
+                f" {row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['Rss']:>8.1f} {row['Pss']:>8.1f}"
+                f" {row['Private']:>10.1f} {row['growth']:>9.1f} {row['store_pss']:>12.1f} {row['cached']:>8}"
+            )
+
+    first, last = rows[True][0], rows[True][-1]
+    saved = rows[False][-1]["Pss"] - last["Pss"]
+    print(f"\nPSS ahorrada frente a la referencia con {last['processes']} procesos: {saved:.1f} MB")
+    growth, reference = per_session_growth(rows[True]), per_session_growth(rows[False])
+    if growth is not None:
+        print(f"Crecimiento de PSS por sesión adicional: {growth:.3f} MB (referencia {reference:.3f} MB)")
+    if last["processes"] > first["processes"]:
+        print(
+            f"PSS de los segmentos: {first['store_pss']:.1f} MB con {first['processes']} proceso(s),"
+            f" {last['store_pss']:.1f} MB con {last['processes']}"
+        )
+        if last["store_pss"] > first["store_pss"] * (1 + args.tolerance):
+            print(f"Los segmentos no se comparten: la PSS crece más de {args.tolerance:.0%} con los procesos.")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    sys.exit(main())
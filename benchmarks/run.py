@@ -0,0 +1,335 @@
+"""Benchmarks de las rutas críticas del dashboard sobre históricos sintéticos.
+
+Mide tiempo de pared y pico de memoria por etapa (agregación del histórico,
+proyecciones, armado del gráfico y formato de la tabla) para históricos de
+distinta longitud, mensuales o diarios, horizontes de 1 a 25 años y con la
+caché de valores derivados fría o caliente. El arranque en frío (hasta la
+primera pintura y hasta el primer gráfico) se mide en intérpretes nuevos. Compara contra
+``benchmarks/baseline.json`` y termina con código 1 si alguna etapa empeora más
+que el umbral configurado, o si las tarjetas incrementales no cuadran con las
+proyecciones. Cada etapa se compara por la mediana de sus ejecuciones, y solo
+cuenta como regresión si además empeora más de ``--min-delta`` segundos y
+sigue empeorando al volver a medirla ``--retries`` veces: en una máquina
+compartida las etapas de pocos milisegundos varían más del 50 % de un minuto
+a otro, y la calibración no sigue esas variaciones.
+
+``--update-baseline`` reescribe la línea base con una sola corrida del árbol
+actual, en la máquina que aplica el control; con ``--only-new`` solo agrega
+las etapas que aún no tiene. Uso, desde la raíz del repositorio::
+
+    python -m benchmarks.run
+    python -m benchmarks.run --history-years 1 10 50 --horizons 1 25 --threshold 0.8
+    python -m benchmarks.run --update-baseline
+    python -m benchmarks.run --update-baseline --only-new
+"""
+
+import argparse
+import atexit
+import gc
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+BASELINE_FILE = Path(__file__).with_name("baseline.json")
+CALIBRATION_KEY = "_calibration"
+
+# Las fuentes de datos y la caché en disco se aíslan antes de importar la app.
+_workdir = Path(tempfile.mkdtemp(prefix="nao-bench-"))
+atexit.register(shutil.rmtree, _workdir, ignore_errors=True)
+os.environ["NAO_CACHE_DIR"] = str(_workdir / "cache")
+os.environ["NAO_DATA_FILE"] = str(_workdir / "historical.json")
+os.environ.pop("NAO_REVENUE_EXPORT", None)
+
+
+def synthetic_history(years: int, end: str = "2025-12") -> list[dict]:
+    """Histórico mensual con tendencia y estacionalidad que termina en ``end``."""
+    import numpy as np
+    import pandas as pd
+
+    months = pd.period_range(end=pd.Period(end, freq="M"), periods=years * 12, freq="M")
+    t = np.arange(len(months))
+    values = 8e6 * 1.006 ** t * (1 + 0.25 * np.sin(2 * np.pi * (months.month.to_numpy() - 1) / 12))
+    return [{"date": date, "value": float(value)} for date, value in zip(months.strftime("%Y-%m"), values.round())]
+
+
+def synthetic_daily_export(years: int, path: Path, end: str = "2025-12-31") -> Path:
+    """Exportación diaria tipo PMS (``date``, ``revenue``) en CSV."""
+    import numpy as np
+    import pandas as pd
+
+    days = pd.date_range(end=end, periods=years * 365, freq="D")
+    revenue = np.random.default_rng(years).uniform(1e5, 6e5, len(days)).round()
+    pd.DataFrame({"date": days.strftime("%Y-%m-%d"), "revenue": revenue}).to_csv(path, index=False)
+    return path
+
+
+def measure(function, repeat: int) -> dict:
+    """Mediana de ``repeat`` ejecuciones y pico de memoria de una ejecución aparte.
+
+    Una primera ejecución sin medir descarta importaciones perezosas y cachés de
+    primer uso ajenas a la etapa; como en ``timeit``, el recolector de basura se
+    desactiva mientras se toma el tiempo.
+    """
+    function()
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    times = []
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function()
+            times.append(time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return {"seconds": statistics.median(times), "peak_bytes": peak}
+
+
+def calibrate(repeat: int) -> float:
+    """Tiempo de una carga fija, para escalar la línea base a la máquina actual."""
+    import numpy as np
+
+    values = np.random.default_rng(0).random(200_000)
+
+    def workload():
+        np.sort(values)
+        "".join(str(value) for value in range(20_000))
+
+    return measure(workload, repeat)["seconds"]
+
+
+# Reproduce el orden de importación de ``app.py``; Streamlit ya está cargado en el servidor.
+STARTUP_PROBE = """
+import json, resource, time
+import streamlit
+started = time.perf_counter()
+from components.summary_card import summary_card
+from constants import INITIAL_INVESTMENT
+from utils.formatting import format_currency
+from utils.metrics import Rerun
+from utils.snapshot import DEFAULT_VIEW, startup_snapshot
+startup_snapshot()
+first_paint = time.perf_counter() - started
+from utils import derived
+from utils.charts import build_figure
+build_figure(derived.chart_data(*DEFAULT_VIEW, "yearly"), "yearly", "moderate")
+first_chart = time.perf_counter() - started
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+print(json.dumps({"first-paint": first_paint, "first-chart": first_chart, "peak_bytes": peak}))
+"""
+
+
+def measure_startup(repeat: int) -> dict[str, dict]:
+    """Mejor arranque en frío de ``repeat`` procesos nuevos, tras uno que genera la instantánea."""
+    runs = []
+    for _ in range(repeat + 1):
+        probe = subprocess.run([sys.executable, "-c", STARTUP_PROBE], cwd=ROOT, check=True, capture_output=True, text=True)
+        runs.append(json.loads(probe.stdout.splitlines()[-1]))
+    runs = runs[1:]
+    peak = min(run["peak_bytes"] for run in runs)
+    return {phase: {"seconds": min(run[phase] for run in runs), "peak_bytes": peak} for phase in ("first-paint", "first-chart")}
+
+
+def clear_derived() -> None:
+    """Vacía las cachés de valores derivados y borra sus segmentos del almacén compartido.
+
+    Sin borrar los segmentos, la retícula de TIR en frío solo volvería a abrir su
+    archivo ``.npy``. El cubo se conserva, como en el resto de las etapas.
+    """
+    from utils.cache import clear_caches
+    from utils.cube import CUBE_SEGMENT
+    from utils.store import STORE_DIR
+
+    clear_caches()
+    for path in STORE_DIR.glob("*.npy"):
+        if not path.name.startswith(f"{CUBE_SEGMENT}."):
+            path.unlink(missing_ok=True)
+
+
+def check_incremental(history: list[dict], horizon: int) -> list[str]:
+    """Diferencias entre las tarjetas incrementales y las sumas de las proyecciones.
+
+    ``final_revenue`` y ``cumulative_revenue`` deben coincidir con la tabla
+    que muestra la app (leída del cubo) y, salvo el redondeo ``float32`` del
+    cubo, con ``generate_projections``.
+    """
+    import numpy as np
+
+    from utils import derived
+    from utils.finance import SCENARIOS, generate_projections
+
+    exact, _ = generate_projections(4.5, 2.0, horizon, history)
+    shown, _ = derived.projections(4.5, 2.0, horizon)
+    mismatches = []
+    for scenario in SCENARIOS:
+        cards = {
+            "final": (derived.final_revenue(4.5, 2.0, horizon, scenario), lambda annual: annual.iloc[-1]),
+            "cumulative": (derived.cumulative_revenue(4.5, 2.0, horizon, scenario), lambda annual: annual.iloc[1:].sum()),
+        }
+        for card, (value, total) in cards.items():
+            for source, frame, rtol in (("tabla", shown, 1e-12), ("motor", exact, 1e-6)):
+                expected = total(frame[scenario])
+                if not np.isclose(value, expected, rtol=rtol, atol=0):
+                    mismatches.append(f"{card}/{scenario}/h{horizon}: {value} != {expected} ({source})")
+    return mismatches
+
+
+def run(
+    history_years: list[int],
+    frequencies: list[str],
+    horizons: list[int],
+    repeat: int,
+    mismatches: list[str],
+    cases: set[str] | None = None,
+) -> dict[str, dict]:
+    """Mide todas las etapas, o solo las de ``cases`` si se indican."""
+    from utils import derived
+    from utils.charts import build_figure
+    from utils.finance import calculate_annual_aggregates, generate_projections
+    from utils.history import set_history
+    from utils.ingest import aggregate_monthly
+
+    results = {}
+
+    def record(case: str, function) -> None:
+        if cases is None or case in cases:
+            results[case] = measure(function, repeat)
+
+    for years in history_years:
+        history = synthetic_history(years)
+        (_workdir / "historical.json").write_text(json.dumps({"initial_investment": 4.5e8, "historical_data": history}))
+        for frequency in frequencies:
+            if frequency == "daily":
+                export = synthetic_daily_export(years, _workdir / f"daily-{years}.csv")
+                record(f"aggregation/daily/{years}y", lambda: aggregate_monthly(export))
+            else:
+                record(f"aggregation/monthly/{years}y", lambda: calculate_annual_aggregates(history))
+
+        set_history(history)
+        derived.projections(4.5, 2.0, 1)  # construye el cubo de esta línea base fuera de la medición
+        for horizon in horizons:
+            if cases is None:
+                mismatches += check_incremental(history, horizon)
+            case = f"{years}y/h{horizon}"
+            record(f"projection/engine/{case}", lambda: generate_projections(4.5, 2.0, horizon, history))
+            stages = {
+                "projection": lambda: derived.projections(4.5, 2.0, horizon),
+                "chart": lambda: build_figure(derived.chart_data(4.5, 2.0, horizon, "monthly"), "monthly", "moderate"),
+                "table": lambda: derived.table(4.5, 2.0, horizon, "monthly", "percent"),
+                "returns": lambda: derived.returns(4.5, 2.0, horizon, 10.0),
+                "irr-lattice": lambda: derived.irr_lattice(horizon),
+                "goal-seek": lambda: derived.goal_seek("cumulative_yield", 5.0, "moderate", horizon, "growth", 4.5),
+                "iso-contour": lambda: derived.iso_contour("cumulative_yield", 5.0, "moderate", horizon),
+            }
+            for stage, function in stages.items():
+                record(f"{stage}/cold/{case}", lambda: (clear_derived(), function()))
+                record(f"{stage}/warm/{case}", function)
+
+    # Con el histórico más largo, que es el último escrito en ``historical.json``.
+    startup = {f"startup/{phase}/{history_years[-1]}y": phase for phase in ("first-paint", "first-chart")}
+    if cases is None or not cases.isdisjoint(startup):
+        measured = measure_startup(repeat)
+        results.update({case: measured[phase] for case, phase in startup.items() if cases is None or case in cases})
+    return results
+
+
+def compare(
+    results: dict, baseline: dict, threshold: float, min_delta: float, calibration: float
+) -> list[tuple[str, str]]:
+    """Etapas cuyo tiempo o memoria superan la línea base en más de ``threshold``.
+
+    Los tiempos de referencia se escalan por la relación entre la calibración
+    actual y la guardada con la línea base.
+    """
+    scale = calibration / baseline.get(CALIBRATION_KEY, {"seconds": calibration})["seconds"]
+    regressions = []
+    for case, current in sorted(results.items()):
+        reference = baseline.get(case)
+        if reference is None:
+            continue
+        seconds, reference_seconds = current["seconds"], reference["seconds"] * scale
+        if seconds > reference_seconds * (1 + threshold) and seconds - reference_seconds > min_delta:
+            regressions.append((case, f"{reference_seconds * 1e3:.3f} ms -> {seconds * 1e3:.3f} ms"))
+        peak, reference_peak = current["peak_bytes"], reference["peak_bytes"]
+        if peak > reference_peak * (1 + threshold) and peak - reference_peak > 64 * 1024:
+            regressions.append((case, f"pico {reference_peak / 1024:.0f} KiB -> {peak / 1024:.0f} KiB"))
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--history-years", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--frequencies", nargs="+", choices=["monthly", "daily"], default=["monthly", "daily"])
+    parser.add_argument("--horizons", type=int, nargs="+", default=[1, 10, 25])
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--threshold", type=float, default=0.5, help="regresión relativa tolerada (0.5 = 50%%)")
+    parser.add_argument("--min-delta", type=float, default=0.01, help="diferencia mínima en segundos a reportar")
+    parser.add_argument(
+        "--retries", type=int, default=2, help="nuevas mediciones de las etapas por encima de la línea base"
+    )
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--only-new", action="store_true", help="con --update-baseline, solo agrega etapas nuevas")
+    args = parser.parse_args(argv)
+
+    calibration = calibrate(args.repeat)
+    mismatches: list[str] = []
+    results = run(args.history_years, args.frequencies, args.horizons, args.repeat, mismatches)
+    for case, result in sorted(results.items()):
+        print(f"{case:40s} {result['seconds'] * 1e3:10.3f} ms {result['peak_bytes'] / 1024:10.0f} KiB")
+    for mismatch in mismatches:
+        print(f"INCONSISTENCIA {mismatch}")
+    if mismatches:
+        return 1
+
+    if args.update_baseline:
+        if args.only_new and args.baseline.exists():
+            baseline = json.loads(args.baseline.read_text())
+            # Las etapas nuevas se escalan a la calibración guardada con la línea base.
+            stored = baseline.setdefault(CALIBRATION_KEY, {"seconds": calibration, "peak_bytes": 0})["seconds"]
+            added = [case for case in sorted(results) if case not in baseline]
+            for case in added:
+                baseline[case] = {**results[case], "seconds": results[case]["seconds"] * stored / calibration}
+            print(f"{len(added)} etapas nuevas agregadas a la línea base en {args.baseline}")
+        else:
+            baseline = {**results, CALIBRATION_KEY: {"seconds": calibration, "peak_bytes": 0}}
+            print(f"Línea base actualizada en {args.baseline}")
+        args.baseline.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"No hay línea base en {args.baseline}; use --update-baseline.")
+        return 0
+    baseline = json.loads(args.baseline.read_text())
+    regressions = compare(results, baseline, args.threshold, args.min_delta, calibration)
+    for _ in range(args.retries):
+        if not regressions:
+            break
+        # Una etapa solo cuenta como regresión si sigue empeorando al medirla otra vez.
+        flagged = {case for case, _ in regressions}
+        print(f"Se vuelven a medir {len(flagged)} etapas por encima de la línea base.")
+        retry = run(args.history_years, args.frequencies, args.horizons, args.repeat, [], flagged)
+        results = {
+            case: {field: min(results[case][field], retry[case][field]) for field in ("seconds", "peak_bytes")}
+            for case in flagged
+        }
+        regressions = compare(results, baseline, args.threshold, args.min_delta, calibration)
+    for case, regression in regressions:
+        print(f"REGRESIÓN {case}: {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    sys.exit(main())
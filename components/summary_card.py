@@ -0,0 +1,26 @@
+"""Tarjeta de KPI de la cabecera del dashboard."""
+
+import html
+
+import streamlit as st
+
+_TREND_ICONS = {"up": "▲", "down": "▼"}
+
+
+def summary_card(title: str, value: str, subtitle: str = "", icon: str = "", trend: str | None = None) -> None:
+    trend_badge = (
+        f'<span style="color:#10b981;font-size:11px;font-weight:700">{_TREND_ICONS[trend]}</span>' if trend else ""
+    )
+    st.markdown(
+        f"""
+        <div style="background:#fff;border:1px solid #e2e8f0;border-radius:12px;padding:16px;height:100%">
+          <div style="display:flex;justify-content:space-between;align-items:center">
+            <span style="font-size:11px;font-weight:700;color:#64748b;text-transform:uppercase">{html.escape(title)}</span>
+            <span style="background:#eef2ff;border-radius:8px;padding:4px 6px">{icon}</span>
+          </div>
+          <div style="font-size:22px;font-weight:800;color:#0f172a;margin-top:8px">{html.escape(value)} {trend_badge}</div>
+          <div style="font-size:11px;color:#94a3b8;margin-top:4px">{html.escape(subtitle)}</div>
+        </div>
+        """,
+        unsafe_allow_html=True,
+    )
@@ -0,0 +1,74 @@
+"""Datos base del hotel: inversión inicial e histórico mensual de ingresos.
+
+Los valores se leen de un archivo JSON con la forma::
+
+    {
+      "initial_investment": 450000000,
+      "historical_data": [{"date": "2021-01", "value": 12345678}, ...]
+    }
+
+La ruta por defecto es ``data/historical.json`` y puede cambiarse con la
+variable de entorno ``NAO_DATA_FILE``.
+
+En producción el histórico puede venir de una exportación de ingresos del PMS
+(CSV o Parquet) indicada en ``NAO_REVENUE_EXPORT``; las columnas de fecha e
+ingreso se configuran con ``NAO_EXPORT_DATE_COLUMN`` y
+``NAO_EXPORT_VALUE_COLUMN``. En ese caso la inversión inicial se toma de
+``NAO_INITIAL_INVESTMENT`` o, si no está definida, del archivo JSON.
+
+Cuando el archivo del histórico cambia con la app en marcha, los meses nuevos
+se anexan al histórico compartido sin reiniciar (ver
+:func:`utils.history.refresh_history`).
+
+El modo portafolio se activa definiendo ``NAO_PORTFOLIO_UNITS`` y
+``NAO_PORTFOLIO_HISTORY`` (ver :mod:`utils.portfolio`).
+"""
+
+import json
+import os
+from pathlib import Path
+
+DATA_FILE = Path(os.environ.get("NAO_DATA_FILE", Path(__file__).parent / "data" / "historical.json"))
+
+
+def _load(path: Path) -> tuple[float, list[dict]]:
+    if not path.exists():
+        raise FileNotFoundError(
+            f"No se encontró el archivo de datos del hotel en {path}. "
+            "Defina NAO_DATA_FILE o cree data/historical.json."
+        )
+    with path.open(encoding="utf-8") as fh:
+        payload = json.load(fh)
+    history = [{"date": str(row["date"]), "value": float(row["value"])} for row in payload["historical_data"]]
+    return float(payload["initial_investment"]), history
+
+
+REVENUE_EXPORT = os.environ.get("NAO_REVENUE_EXPORT")
+PORTFOLIO_UNITS = os.environ.get("NAO_PORTFOLIO_UNITS")
+PORTFOLIO_HISTORY = os.environ.get("NAO_PORTFOLIO_HISTORY")
+
+# Archivo del que sale el histórico; :func:`utils.history.refresh_history` vigila su ``mtime``.
+HISTORY_SOURCE = Path(REVENUE_EXPORT) if REVENUE_EXPORT else DATA_FILE
+
+
+def load_history() -> list[dict]:
+    """Vuelve a leer el histórico mensual de ``HISTORY_SOURCE``."""
+    if REVENUE_EXPORT:
+        from utils.ingest import load_revenue_export
+
+        return load_revenue_export(
+            REVENUE_EXPORT,
+            date_column=os.environ.get("NAO_EXPORT_DATE_COLUMN", "date"),
+            value_column=os.environ.get("NAO_EXPORT_VALUE_COLUMN", "revenue"),
+        ).monthly
+    return _load(DATA_FILE)[1]
+
+
+# El ``mtime`` se toma antes de leer, así que un cambio durante la lectura se detecta después.
+HISTORY_MTIME_NS = HISTORY_SOURCE.stat().st_mtime_ns if HISTORY_SOURCE.exists() else None
+
+if REVENUE_EXPORT:
+    HISTORICAL_DATA = load_history()
+    INITIAL_INVESTMENT = float(os.environ.get("NAO_INITIAL_INVESTMENT") or _load(DATA_FILE)[0])
+else:
+    INITIAL_INVESTMENT, HISTORICAL_DATA = _load(DATA_FILE)
@@ -0,0 +1,187 @@
+"""Caché LRU compartida por todo el proceso para los valores derivados del dashboard.
+
+Streamlit vuelve a ejecutar ``app.py`` en cada interacción y en cada sesión,
+así que las cachés viven en este módulo (importado una sola vez por proceso) y
+se obtienen por nombre con :func:`named_cache`. Si varias sesiones piden la
+misma clave a la vez, solo una calcula el valor y las demás esperan su
+resultado. Los valores se comparten entre sesiones y no deben mutarse.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from functools import wraps
+from typing import Any
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    size: int
+    maxsize: int
+
+
+class _Pending:
+    def __init__(self):
+        self.event = threading.Event()
+        self.value: Any = None
+        self.error: BaseException | None = None
+
+
+# Resultado de la última consulta hecha por el hilo actual (una sesión de Streamlit por hilo).
+_lookup = threading.local()
+
+
+def last_lookup_hit() -> bool | None:
+    """``True``/``False`` si la última consulta del hilo fue acierto/fallo; ``None`` si no hubo."""
+    return getattr(_lookup, "hit", None)
+
+
+def reset_last_lookup() -> None:
+    _lookup.hit = None
+
+
+class LRUCache:
+    """Caché acotada con desalojo LRU, TTL opcional y contadores.
+
+    ``on_evict`` se llama con cada valor que sale de la caché (por desalojo,
+    expiración o :meth:`clear`), fuera del candado; sirve para liberar
+    recursos como las referencias a segmentos de :mod:`utils.store`.
+    """
+
+    def __init__(self, maxsize: int = 128, ttl: float | None = None, on_evict: Callable[[Any], None] | None = None):
+        if maxsize < 1:
+            raise ValueError("maxsize debe ser al menos 1.")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.on_evict = on_evict
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._pending: dict[Hashable, _Pending] = {}
+        self._lock = threading.Lock()
+        self._hits = self._misses = self._evictions = self._expirations = 0
+
+    def _evicted(self, values: list) -> None:
+        if self.on_evict is not None:
+            for value in values:
+                self.on_evict(value)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        expired = []
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                if self.ttl is None or time.monotonic() - stored_at < self.ttl:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    _lookup.hit = True
+                    return value
+                del self._entries[key]
+                self._expirations += 1
+                expired.append(value)
+            pending = self._pending.get(key)
+            owner = pending is None
+            if owner:
+                pending = self._pending[key] = _Pending()
+                self._misses += 1
+            else:
+                self._hits += 1
+        self._evicted(expired)
+
+        if not owner:
+            pending.event.wait()
+            if pending.error is not None:
+                raise pending.error
+            _lookup.hit = True
+            return pending.value
+
+        try:
+            value = compute()
+        except BaseException as error:
+            pending.error = error
+            with self._lock:
+                del self._pending[key]
+            pending.event.set()
+            raise
+
+        evicted = []
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                evicted.append(self._entries.popitem(last=False)[1][1])
+                self._evictions += 1
+            del self._pending[key]
+        pending.value = value
+        pending.event.set()
+        self._evicted(evicted)
+        _lookup.hit = False
+        return value
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and (self.ttl is None or time.monotonic() - entry[0] < self.ttl)
+
+    def clear(self) -> None:
+        with self._lock:
+            values = [value for _, value in self._entries.values()]
+            self._entries.clear()
+        self._evicted(values)
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                self._hits, self._misses, self._evictions, self._expirations, len(self._entries), self.maxsize
+            )
+
+
+_registry: dict[str, LRUCache] = {}
+_registry_lock = threading.Lock()
+
+
+def named_cache(
+    name: str, maxsize: int = 128, ttl: float | None = None, on_evict: Callable[[Any], None] | None = None
+) -> LRUCache:
+    """Devuelve la caché ``name`` del proceso, creándola la primera vez."""
+    with _registry_lock:
+        cache = _registry.get(name)
+        if cache is None:
+            cache = _registry[name] = LRUCache(maxsize, ttl, on_evict)
+        return cache
+
+
+def memoize(name: str, maxsize: int = 128, ttl: float | None = None, on_evict: Callable[[Any], None] | None = None):
+    """Decorador que memoiza una función en la caché ``name`` usando sus argumentos como clave."""
+
+    def decorator(function):
+        cache = named_cache(name, maxsize, ttl, on_evict)
+
+        @wraps(function)
+        def wrapper(*args):
+            return cache.get_or_compute(args, lambda: function(*args))
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
+
+
+def clear_caches() -> None:
+    """Vacía todas las cachés registradas sin reiniciar sus contadores."""
+    with _registry_lock:
+        caches = list(_registry.values())
+    for cache in caches:
+        cache.clear()
+
+
+def cache_stats() -> dict[str, CacheStats]:
+    """Contadores de todas las cachés registradas en el proceso."""
+    with _registry_lock:
+        caches = dict(_registry)
+    return {name: cache.stats() for name, cache in caches.items()}
@@ -0,0 +1,169 @@
+"""Construcción del gráfico de proyección de rentabilidad.
+
+Las series se arman por columnas (arreglos de NumPy, no listas de filas) y se
+reducen con un muestreo min/max por cubetas a un presupuesto de puntos de
+aproximadamente uno por píxel de ancho: cada cubeta conserva su mínimo y su
+máximo, así que la forma de la curva (picos de temporada incluidos) se
+mantiene aunque el horizonte o el histórico crezcan. Las trazas usan WebGL
+(``Scattergl``).
+
+Streamlit no informa al script el ancho con que se dibuja el gráfico, así que
+la app usa el ancho de referencia :data:`DEFAULT_CHART_WIDTH` (el del área
+principal en el diseño ``wide`` de un monitor común); quien conozca el ancho
+real, como un informe con tamaño fijo, puede pasarlo en ``width_px``.
+
+Plotly se importa al construir la primera figura y no al importar el módulo,
+para no cargarlo en procesos sin Streamlit que no dibujan gráficos; dentro de
+la app ya lo importa Streamlit al arrancar.
+"""
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+
+from utils.finance import SCENARIOS
+
+# Ancho de referencia en píxeles para el presupuesto de puntos.
+DEFAULT_CHART_WIDTH = 1200
+
+SCENARIO_NAMES = {"pessimistic": "Pesimista", "moderate": "Moderado", "optimistic": "Optimista"}
+SCENARIO_COLORS = {"pessimistic": "#ef4444", "moderate": "#10b981", "optimistic": "#f59e0b"}
+
+
+def point_budget(width_px: int = DEFAULT_CHART_WIDTH) -> int:
+    """Puntos por serie: aproximadamente uno por píxel de ancho."""
+    return max(int(width_px), 16)
+
+
+def minmax_indices(y: np.ndarray, budget: int) -> np.ndarray:
+    """Índices ordenados que conservan extremos y el mínimo y máximo de cada cubeta."""
+    n = len(y)
+    if n <= budget:
+        return np.arange(n)
+    buckets = max((budget - 2) // 2, 1)
+    edges = 1 + (np.arange(buckets + 1) * (n - 2)) // buckets
+    index = edges[:-1, None] + np.arange(np.diff(edges).max())
+    values = np.where(index < edges[1:, None], y[np.minimum(index, n - 1)], np.nan)
+    rows = np.arange(buckets)
+    picked = [[0, n - 1], index[rows, np.nanargmin(values, axis=1)], index[rows, np.nanargmax(values, axis=1)]]
+    return np.unique(np.concatenate(picked))
+
+
+def downsample(x: np.ndarray, *columns: np.ndarray, budget: int) -> tuple[np.ndarray, ...]:
+    """Reduce varias columnas que comparten ``x`` con los mismos índices."""
+    if len(x) <= budget:
+        return (x, *columns)
+    share = max(budget // len(columns), 16)
+    index = np.unique(np.concatenate([minmax_indices(column, share) for column in columns]))
+    return (x[index], *(column[index] for column in columns))
+
+
+def _x_axis(labels: pd.Series, time_granularity: str) -> np.ndarray:
+    # Los bloques anuales no siempre son años calendario (p. ej. "abr 2026–mar 2027"),
+    # así que la vista anual usa un eje de categorías con las etiquetas tal cual.
+    if time_granularity == "yearly":
+        return labels.astype(str).to_numpy()
+    return pd.PeriodIndex(labels, freq="M").to_timestamp().to_numpy()
+
+
+def build_figure(
+    chart: pd.DataFrame,
+    time_granularity: str,
+    selected_scenario: str,
+    bands: pd.DataFrame | None = None,
+    width_px: int = DEFAULT_CHART_WIDTH,
+) -> "go.Figure":
+    """Figura con la serie real y los escenarios (o las bandas de Monte Carlo).
+
+    ``chart`` es la tabla de :func:`utils.derived.chart_data`; ``bands`` son
+    las bandas anuales o mensuales de :func:`utils.montecarlo.simulate_bands`.
+    """
+    import plotly.graph_objects as go
+
+    budget = point_budget(width_px)
+    x = _x_axis(chart["label"], time_granularity)
+    actual = chart["actual"].to_numpy()
+    has_actual = ~np.isnan(actual)
+    anchor = np.flatnonzero(has_actual)[-1]
+
+    figure = go.Figure()
+    history_x, history_y = downsample(x[has_actual], actual[has_actual], budget=budget)
+    figure.add_trace(go.Scattergl(
+        x=history_x, y=history_y, name="Real", mode="lines",
+        line=dict(color="#4f46e5", width=4), fill="tozeroy", fillcolor="rgba(79,70,229,0.12)",
+    ))
+
+    if bands is None:
+        for scenario in SCENARIOS:
+            values = chart[scenario].to_numpy()
+            present = ~np.isnan(values)
+            scenario_x, scenario_y = downsample(x[present], values[present], budget=budget)
+            selected = scenario == selected_scenario
+            figure.add_trace(go.Scattergl(
+                x=scenario_x, y=scenario_y, name=SCENARIO_NAMES[scenario], mode="lines",
+                line=dict(color=SCENARIO_COLORS[scenario], width=4 if selected else 2,
+                          dash="solid" if selected else "dash"),
+            ))
+    else:
+        band_x = np.concatenate([x[anchor:anchor + 1], _x_axis(bands.iloc[:, 0].astype(str), time_granularity)])
+        columns = {name: np.concatenate([actual[anchor:anchor + 1], bands[name].to_numpy()]) for name in bands.columns[1:]}
+        band_x, *sampled = downsample(band_x, *columns.values(), budget=budget)
+        columns = dict(zip(columns, sampled))
+        for low, high, opacity in (("p5", "p95", 0.15), ("p25", "p75", 0.3)):
+            figure.add_trace(go.Scattergl(
+                x=band_x, y=columns[low], mode="lines", line=dict(width=0), showlegend=False, hoverinfo="skip",
+            ))
+            figure.add_trace(go.Scattergl(
+                x=band_x, y=columns[high], name=f"{low.upper()}–{high.upper()}", mode="lines",
+                line=dict(width=0), fill="tonexty", fillcolor=f"rgba(16,185,129,{opacity})",
+            ))
+        figure.add_trace(go.Scattergl(
+            x=band_x, y=columns["p50"], name="P50", mode="lines", line=dict(color="#10b981", width=4),
+        ))
+
+    figure.update_layout(
+        height=450, margin=dict(t=10, r=10, l=10, b=20), hovermode="x unified",
+        yaxis=dict(tickprefix="$", tickformat="~s"), legend=dict(orientation="h", y=1.08),
+        xaxis=dict(type="category") if time_granularity == "yearly" else dict(tickformat="%Y-%m"),
+    )
+    return figure
+
+
+def build_irr_heatmap(
+    irr: np.ndarray, ipc_rate: float, growth_factor: float, contour: np.ndarray | None = None, contour_name: str = ""
+) -> "go.Figure":
+    """Mapa de calor de la TIR de un escenario sobre la retícula IPC × crecimiento.
+
+    ``irr`` tiene forma ``(ipc, crecimiento)`` (un corte de
+    :func:`utils.derived.irr_lattice`); el punto marca la selección actual.
+    ``contour`` es el crecimiento requerido por cada IPC de la retícula
+    (:func:`utils.derived.iso_contour`) y se dibuja como una línea.
+    """
+    import plotly.graph_objects as go
+
+    from utils.cube import GROWTH_GRID, IPC_GRID
+
+    figure = go.Figure(go.Heatmap(
+        x=IPC_GRID, y=GROWTH_GRID, z=irr.T, colorscale="Viridis", colorbar=dict(tickformat=".0%", title="TIR"),
+        hovertemplate="IPC %{x:.1f}% · Crecimiento %{y:.1f}%<br>TIR %{z:.2%}<extra></extra>",
+    ))
+    if contour is not None:
+        inside = (contour >= GROWTH_GRID[0]) & (contour <= GROWTH_GRID[-1])
+        figure.add_trace(go.Scatter(
+            x=IPC_GRID, y=np.where(inside, contour, np.nan), name=contour_name, mode="lines",
+            line=dict(color="#f43f5e", width=3, dash="dot"),
+            hovertemplate="IPC %{x:.1f}% · Crecimiento requerido %{y:.2f}%<extra></extra>",
+        ))
+    figure.add_trace(go.Scatter(
+        x=[ipc_rate], y=[growth_factor], mode="markers", showlegend=False, hoverinfo="skip",
+        marker=dict(color="#ffffff", size=12, line=dict(color="#0f172a", width=2)),
+    ))
+    figure.update_layout(
+        height=380, margin=dict(t=10, r=10, l=10, b=20), legend=dict(orientation="h", y=1.08),
+        xaxis=dict(title="IPC anual (%)"), yaxis=dict(title="Crecimiento orgánico (%)"),
+    )
+    return figure
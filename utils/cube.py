@@ -0,0 +1,167 @@
+"""Cubo precalculado de proyecciones para todo el dominio de los sliders.
+
+Los tres sliders del panel de control tienen dominios discretos (IPC de 0 a 15
+en pasos de 0.1, crecimiento de -5 a 10 en pasos de 0.5, años de 1 a 25), así
+que toda proyección que el dashboard puede mostrar vive en una retícula finita.
+Como la proyección a ``n`` años es el prefijo de la proyección a 25 años, basta
+guardar el horizonte máximo: un arreglo ``float32`` de forma
+``(ipc, crecimiento, escenario, mes)`` que vive en el almacén compartido de
+:mod:`utils.store`; todas las sesiones y procesos lo abren con ``mmap`` y lo
+recortan sin copiarlo.
+
+El cubo se reconstruye solo cuando cambia la huella de la línea base del
+histórico (ancla y últimos doce meses, de los que dependen las proyecciones),
+``INITIAL_INVESTMENT`` o de los parámetros del modelo. Para generarlo por
+adelantado::
+
+    python -m utils.cube
+"""
+
+import hashlib
+import json
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from utils.finance import (
+    MONTHS_PER_YEAR,
+    SCENARIO_GROWTH_SHIFT,
+    Projections,
+    baseline,
+    project_monthly,
+    projection_frames,
+    scenario_rates,
+)
+from utils.store import ArrayStore, Lease, array_store
+
+IPC_MIN, IPC_MAX, IPC_STEP = 0.0, 15.0, 0.1
+GROWTH_MIN, GROWTH_MAX, GROWTH_STEP = -5.0, 10.0, 0.5
+MAX_YEARS = 25
+
+IPC_GRID = np.round(IPC_MIN + IPC_STEP * np.arange(round((IPC_MAX - IPC_MIN) / IPC_STEP) + 1), 1)
+GROWTH_GRID = np.round(GROWTH_MIN + GROWTH_STEP * np.arange(round((GROWTH_MAX - GROWTH_MIN) / GROWTH_STEP) + 1), 1)
+
+# Nombre del cubo en el almacén compartido (``.cache/store/projection_cube.<huella>.npy``).
+CUBE_SEGMENT = "projection_cube"
+
+# Se incrementa cuando cambia la forma de calcular las proyecciones.
+CUBE_VERSION = 1
+
+
+def _grid_index(value: float, start: float, step: float, size: int, name: str) -> int:
+    position = (value - start) / step
+    index = int(round(position))
+    if not 0 <= index < size or abs(position - index) > 1e-6:
+        raise ValueError(f"{name}={value} está fuera de la retícula precalculada.")
+    return index
+
+
+def grid_point(ipc_rate: float, growth_factor: float, years_to_project: float) -> tuple[float, float, int]:
+    """Valores exactos de la retícula para un juego de sliders.
+
+    Solo absorbe el ruido de coma flotante (``4.4999999`` es ``4.5``); un valor
+    entre dos pasos de un slider, como ``4.55``, es un ``ValueError``.
+    """
+    i = _grid_index(float(ipc_rate), IPC_MIN, IPC_STEP, len(IPC_GRID), "ipc_rate")
+    j = _grid_index(float(growth_factor), GROWTH_MIN, GROWTH_STEP, len(GROWTH_GRID), "growth_factor")
+    years = _grid_index(float(years_to_project), 1, 1, MAX_YEARS, "years_to_project") + 1
+    return float(IPC_GRID[i]), float(GROWTH_GRID[j]), years
+
+
+def fingerprint(anchor: pd.Period, base: np.ndarray, initial_investment: float) -> str:
+    """Huella de los datos y parámetros de los que depende el cubo."""
+    payload = {
+        "version": CUBE_VERSION,
+        "anchor": str(anchor),
+        "base": np.asarray(base, dtype=float).tolist(),
+        "initial_investment": initial_investment,
+        "ipc": [IPC_MIN, IPC_MAX, IPC_STEP],
+        "growth": [GROWTH_MIN, GROWTH_MAX, GROWTH_STEP],
+        "years": MAX_YEARS,
+        "shift": SCENARIO_GROWTH_SHIFT.tolist(),
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+class ProjectionCube:
+    """Vista de solo lectura sobre el cubo ``(ipc, crecimiento, escenario, mes)``."""
+
+    def __init__(self, monthly: np.ndarray, anchor: pd.Period, base: np.ndarray, fingerprint: str):
+        self.monthly = monthly
+        self.anchor = anchor
+        self.base = base
+        self.fingerprint = fingerprint
+
+    def index(self, ipc_rate: float, growth_factor: float) -> tuple[int, int]:
+        return (
+            _grid_index(ipc_rate, IPC_MIN, IPC_STEP, len(IPC_GRID), "ipc_rate"),
+            _grid_index(growth_factor, GROWTH_MIN, GROWTH_STEP, len(GROWTH_GRID), "growth_factor"),
+        )
+
+    def monthly_slice(self, ipc_rate: float, growth_factor: float, years_to_project: int) -> np.ndarray:
+        """Serie mensual ``(3, años * 12)`` sin copiar datos del cubo."""
+        if not 1 <= years_to_project <= MAX_YEARS:
+            raise ValueError(f"years_to_project={years_to_project} está fuera de la retícula precalculada.")
+        i, j = self.index(ipc_rate, growth_factor)
+        return self.monthly[i, j, :, : years_to_project * MONTHS_PER_YEAR]
+
+    def projections(self, ipc_rate: float, growth_factor: float, years_to_project: int) -> Projections:
+        """Equivalente a ``generate_projections`` leyendo del cubo."""
+        monthly = self.monthly_slice(ipc_rate, growth_factor, years_to_project).astype(float)
+        return projection_frames(self.anchor, self.base, monthly)
+
+
+def build_cube(base: np.ndarray) -> np.ndarray:
+    """Calcula el cubo completo ``(ipc, crecimiento, escenario, mes)`` en ``float32``."""
+    rates = scenario_rates(IPC_GRID[:, None], GROWTH_GRID[None, :])
+    return project_monthly(base, rates, MAX_YEARS).astype(np.float32)
+
+
+# Cubo vigente del proceso por almacén, con la referencia que lo mantiene abierto.
+_loaded: dict[Path, tuple[ProjectionCube, Lease]] = {}
+_loaded_lock = threading.Lock()
+
+
+def load_cube(
+    history: list[dict] | None = None, initial_investment: float | None = None, store: ArrayStore | None = None
+) -> ProjectionCube:
+    """Abre el cubo del almacén compartido con ``mmap``, reconstruyéndolo si los datos cambiaron.
+
+    Sin ``history`` se usa la línea base del histórico compartido del proceso.
+    El proceso conserva una referencia al cubo vigente y la suelta cuando
+    cambia la huella, de modo que el segmento anterior se borra en cuanto
+    ningún otro proceso lo tenga abierto.
+    """
+    if history is None:
+        from utils.history import history_store
+
+        anchor, base = history_store().baseline()
+    else:
+        anchor, base = baseline(history)
+    if initial_investment is None:
+        from constants import INITIAL_INVESTMENT
+
+        initial_investment = INITIAL_INVESTMENT
+    store = store or array_store()
+    expected = fingerprint(anchor, base, initial_investment)
+    loaded = _loaded.get(store.directory)
+    if loaded is not None and loaded[0].fingerprint == expected:
+        return loaded[0]
+
+    with _loaded_lock:
+        loaded = _loaded.get(store.directory)
+        if loaded is not None and loaded[0].fingerprint == expected:
+            return loaded[0]
+        lease = store.acquire(CUBE_SEGMENT, expected, lambda: build_cube(base))
+        cube = ProjectionCube(lease.array, anchor, np.asarray(base, dtype=float), expected)
+        _loaded[store.directory] = (cube, lease)
+    if loaded is not None:
+        loaded[1].release()
+    return cube
+
+
+if __name__ == "__main__":
+    cube = load_cube()
+    print(f"Cubo escrito en {array_store().path(CUBE_SEGMENT, cube.fingerprint)}")
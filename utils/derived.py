@@ -0,0 +1,270 @@
+"""Valores derivados del dashboard memoizados a nivel de proceso.
+
+Cada función usa como clave las mismas dependencias que tenían los ``useMemo``
+de la versión en React, de modo que las sesiones que comparten parámetros
+(por ejemplo los valores por defecto 4.5 / 2.0 / 10) comparten un solo cálculo.
+Las claves incluyen además el ancla del histórico compartido: al cerrar un mes
+nuevo, solo se recalculan los valores que dependen de la línea base y las
+entradas anteriores salen de la caché por LRU. Los resultados se comparten
+entre sesiones y no deben mutarse.
+"""
+
+import numpy as np
+import pandas as pd
+
+from utils.cache import memoize
+from utils.cube import IPC_GRID, load_cube
+from utils.finance import MONTHS_PER_YEAR, SCENARIOS, Projections, projection_frames
+from utils.goalseek import solve
+from utils.history import history_store
+from utils.incremental import ScenarioSeries, cube_source
+from utils.montecarlo import Distribution, FanBands, MonteCarloConfig, simulate_bands, simulate_return_bands
+from utils.portfolio import Portfolio, PortfolioProjection, load_portfolio_files, project_portfolio
+from utils.returns import ReturnMetrics, irr, return_metrics
+from utils.store import Lease, array_store
+from utils.table import formatted_table
+
+
+def historical_annual() -> dict[int, float]:
+    """Totales anuales históricos, mantenidos en O(1) por el histórico compartido."""
+    return history_store().annual
+
+
+@memoize("scenario_series", maxsize=512)
+def _scenario_series(anchor: pd.Period, ipc_rate: float, growth_factor: float) -> ScenarioSeries:
+    return ScenarioSeries(cube_source(load_cube(), ipc_rate, growth_factor))
+
+
+def scenario_series(ipc_rate: float, growth_factor: float) -> ScenarioSeries:
+    """Serie incremental del par (IPC, crecimiento); el horizonte se amplía bajo demanda."""
+    return _scenario_series(history_store().anchor, ipc_rate, growth_factor)
+
+
+@memoize("projections", maxsize=512)
+def _projections(anchor: pd.Period, ipc_rate: float, growth_factor: float, years_to_project: int) -> Projections:
+    cube = load_cube()
+    monthly = scenario_series(ipc_rate, growth_factor).monthly(years_to_project)
+    return projection_frames(cube.anchor, cube.base, monthly)
+
+
+def projections(ipc_rate: float, growth_factor: float, years_to_project: int) -> Projections:
+    return _projections(history_store().anchor, ipc_rate, growth_factor, years_to_project)
+
+
+def cumulative_revenue(ipc_rate: float, growth_factor: float, years_to_project: int, scenario: str) -> float:
+    """Ingresos acumulados del escenario desde el primer año proyectado."""
+    return scenario_series(ipc_rate, growth_factor).cumulative(scenario, years_to_project)
+
+
+def final_revenue(ipc_rate: float, growth_factor: float, years_to_project: int, scenario: str) -> float:
+    """Ingresos del último año proyectado del escenario."""
+    return scenario_series(ipc_rate, growth_factor).final(scenario, years_to_project)
+
+
+@memoize("chart_data", maxsize=512)
+def _chart_data(
+    anchor: pd.Period, ipc_rate: float, growth_factor: float, years_to_project: int, time_granularity: str
+) -> pd.DataFrame:
+    annual, monthly = projections(ipc_rate, growth_factor, years_to_project)
+    store = history_store()
+    if time_granularity == "yearly":
+        # Solo años cerrados; si el ancla no es diciembre, el punto de partida de
+        # los escenarios son los doce meses que terminan en ella.
+        closed_year = anchor.year if anchor.month == 12 else anchor.year - 1
+        totals = store.annual_through(closed_year)
+        history = pd.DataFrame({"label": [str(year) for year in totals], "actual": list(totals.values())})
+        future = annual.rename(columns={"year": "label"}).astype({"label": str})
+        if closed_year == anchor.year:
+            start, future = future.iloc[0], future.iloc[1:]
+        else:
+            start = {scenario: np.nan for scenario in SCENARIOS}
+    else:
+        history = pd.DataFrame(store.months_through(anchor)).rename(columns={"date": "label", "value": "actual"})
+        future = monthly.rename(columns={"date": "label"})
+        start = {scenario: history["actual"].iloc[-1] for scenario in SCENARIOS}
+    for scenario in SCENARIOS:
+        history[scenario] = np.nan
+        history.loc[history.index[-1], scenario] = start[scenario]
+    return pd.concat([history, future.assign(actual=np.nan)], ignore_index=True)
+
+
+def chart_data(ipc_rate: float, growth_factor: float, years_to_project: int, time_granularity: str) -> pd.DataFrame:
+    """Serie histórica y proyectada con columnas ``label``, ``actual`` y una por escenario.
+
+    Los escenarios arrancan en el último punto histórico (en la vista anual, en
+    los doce meses que terminan en el ancla) para que las líneas queden unidas
+    a la serie real.
+    """
+    return _chart_data(history_store().anchor, ipc_rate, growth_factor, years_to_project, time_granularity)
+
+
+@memoize("table", maxsize=512)
+def _table(
+    anchor: pd.Period,
+    ipc_rate: float,
+    growth_factor: float,
+    years_to_project: int,
+    time_granularity: str,
+    view_mode: str,
+) -> pd.DataFrame:
+    from constants import INITIAL_INVESTMENT
+
+    annual, monthly = projections(ipc_rate, growth_factor, years_to_project)
+    source = annual if time_granularity == "yearly" else monthly
+    return formatted_table(source, view_mode, time_granularity, INITIAL_INVESTMENT)
+
+
+def table(
+    ipc_rate: float, growth_factor: float, years_to_project: int, time_granularity: str, view_mode: str
+) -> pd.DataFrame:
+    """Tabla Detallada de Rentabilidad completa y formateada; la app muestra una página."""
+    return _table(history_store().anchor, ipc_rate, growth_factor, years_to_project, time_granularity, view_mode)
+
+
+def _monte_carlo_config(
+    ipc_rate: float, growth_factor: float, ipc_std: float, growth_std: float, paths: int
+) -> MonteCarloConfig:
+    # Semilla fija: las bandas y los indicadores de retorno salen de las mismas trayectorias.
+    return MonteCarloConfig(
+        ipc=Distribution("normal", (ipc_rate, ipc_std)),
+        growth=Distribution("normal", (growth_factor, growth_std)),
+        paths=paths,
+        seed=0,
+    )
+
+
+@memoize("fan_bands", maxsize=64)
+def _fan_bands(
+    anchor: pd.Period,
+    ipc_rate: float,
+    growth_factor: float,
+    years_to_project: int,
+    ipc_std: float,
+    growth_std: float,
+    paths: int,
+) -> FanBands:
+    config = _monte_carlo_config(ipc_rate, growth_factor, ipc_std, growth_std, paths)
+    return simulate_bands(config, years_to_project, history_store().months_through(anchor))
+
+
+def fan_bands(
+    ipc_rate: float, growth_factor: float, years_to_project: int, ipc_std: float, growth_std: float, paths: int
+) -> FanBands:
+    return _fan_bands(history_store().anchor, ipc_rate, growth_factor, years_to_project, ipc_std, growth_std, paths)
+
+
+@memoize("returns", maxsize=512)
+def _returns(
+    anchor: pd.Period, ipc_rate: float, growth_factor: float, years_to_project: int, discount_rate: float
+) -> ReturnMetrics:
+    from constants import INITIAL_INVESTMENT
+
+    monthly = scenario_series(ipc_rate, growth_factor).monthly(years_to_project)
+    return return_metrics(monthly, INITIAL_INVESTMENT, discount_rate)
+
+
+def returns(ipc_rate: float, growth_factor: float, years_to_project: int, discount_rate: float) -> ReturnMetrics:
+    """VPN, TIR y recuperación de los tres escenarios, en el orden de ``SCENARIOS``."""
+    return _returns(history_store().anchor, ipc_rate, growth_factor, years_to_project, discount_rate)
+
+
+# Prefijo de los segmentos del almacén con la TIR de la retícula, uno por horizonte.
+IRR_LATTICE_SEGMENT = "irr_lattice"
+
+
+@memoize("irr_lattice", maxsize=25, on_evict=Lease.release)
+def _irr_lattice(anchor: pd.Period, years_to_project: int) -> Lease:
+    from constants import INITIAL_INVESTMENT
+
+    cube = load_cube()
+    return array_store().acquire(
+        f"{IRR_LATTICE_SEGMENT}_{years_to_project}y",
+        cube.fingerprint,
+        lambda: irr(cube.monthly[..., : years_to_project * MONTHS_PER_YEAR], INITIAL_INVESTMENT),
+    )
+
+
+def irr_lattice(years_to_project: int) -> np.ndarray:
+    """TIR de toda la retícula de sliders con forma ``(ipc, crecimiento, escenario)``.
+
+    No depende de la tasa de descuento, así que hay a lo sumo una por horizonte.
+    Vive en el almacén compartido: la calcula el primer proceso que la pide.
+    """
+    return _irr_lattice(history_store().anchor, years_to_project).array
+
+
+@memoize("return_bands", maxsize=64)
+def _return_bands(
+    anchor: pd.Period,
+    ipc_rate: float,
+    growth_factor: float,
+    years_to_project: int,
+    ipc_std: float,
+    growth_std: float,
+    paths: int,
+    discount_rate: float,
+) -> pd.DataFrame:
+    from constants import INITIAL_INVESTMENT
+
+    config = _monte_carlo_config(ipc_rate, growth_factor, ipc_std, growth_std, paths)
+    return simulate_return_bands(
+        config, years_to_project, INITIAL_INVESTMENT, discount_rate, history_store().months_through(anchor)
+    )
+
+
+def return_bands(
+    ipc_rate: float,
+    growth_factor: float,
+    years_to_project: int,
+    ipc_std: float,
+    growth_std: float,
+    paths: int,
+    discount_rate: float,
+) -> pd.DataFrame:
+    """Percentiles P5–P95 de VPN, TIR y recuperación en modo estocástico."""
+    return _return_bands(
+        history_store().anchor, ipc_rate, growth_factor, years_to_project, ipc_std, growth_std, paths, discount_rate
+    )
+
+
+@memoize("goal_seek", maxsize=256)
+def _goal_seek(
+    anchor: pd.Period, target: str, value: float, scenario: str, years_to_project: int, solve_for: str, fixed: float
+) -> float:
+    from constants import INITIAL_INVESTMENT
+
+    _, base = history_store().baseline()
+    return float(solve(target, value, scenario, years_to_project, solve_for, fixed, base, INITIAL_INVESTMENT))
+
+
+def goal_seek(target: str, value: float, scenario: str, years_to_project: int, solve_for: str, fixed: float) -> float:
+    """IPC o crecimiento (pp) que alcanza la meta con el otro parámetro fijo; ``nan`` si es inalcanzable."""
+    return _goal_seek(history_store().anchor, target, value, scenario, years_to_project, solve_for, fixed)
+
+
+@memoize("iso_contour", maxsize=64)
+def _iso_contour(anchor: pd.Period, target: str, value: float, scenario: str, years_to_project: int) -> np.ndarray:
+    from constants import INITIAL_INVESTMENT
+
+    _, base = history_store().baseline()
+    return solve(target, value, scenario, years_to_project, "growth", IPC_GRID, base, INITIAL_INVESTMENT)
+
+
+def iso_contour(target: str, value: float, scenario: str, years_to_project: int) -> np.ndarray:
+    """Crecimiento requerido para cada IPC de la retícula: la curva donde se alcanza justo la meta."""
+    return _iso_contour(history_store().anchor, target, value, scenario, years_to_project)
+
+
+@memoize("portfolio", maxsize=1)
+def portfolio() -> Portfolio | None:
+    """Portafolio configurado en ``constants``, o ``None`` si el modo está desactivado."""
+    from constants import PORTFOLIO_HISTORY, PORTFOLIO_UNITS
+
+    if not (PORTFOLIO_UNITS and PORTFOLIO_HISTORY):
+        return None
+    return load_portfolio_files(PORTFOLIO_UNITS, PORTFOLIO_HISTORY)
+
+
+@memoize("portfolio_projection", maxsize=32)
+def portfolio_projection(ipc_rate: float, growth_factor: float, years_to_project: int) -> PortfolioProjection:
+    return project_portfolio(portfolio(), ipc_rate, growth_factor, years_to_project)
@@ -0,0 +1,118 @@
+"""Motor financiero del dashboard: agregados históricos y proyecciones.
+
+Las proyecciones se calculan de forma vectorizada: los tres escenarios para
+todos los meses del horizonte salen de una sola operación sobre un arreglo
+``(escenario, mes)`` y el consolidado anual es un ``reshape`` + ``sum``.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from utils.formatting import format_year_block
+
+SCENARIOS = ("pessimistic", "moderate", "optimistic")
+
+# Ajuste en puntos porcentuales sobre el crecimiento orgánico de cada escenario.
+SCENARIO_GROWTH_SHIFT = np.array([-2.0, 0.0, 2.0])
+
+MONTHS_PER_YEAR = 12
+
+
+class Projections(NamedTuple):
+    annual: pd.DataFrame
+    monthly: pd.DataFrame
+
+
+def _history(history: list[dict] | None) -> list[dict]:
+    if history is None:
+        from constants import HISTORICAL_DATA
+
+        return HISTORICAL_DATA
+    return history
+
+
+def calculate_annual_aggregates(history: list[dict] | None = None) -> dict[int, float]:
+    """Suma los ingresos mensuales históricos por año calendario."""
+    frame = pd.DataFrame(_history(history))
+    years = frame["date"].str.slice(0, 4).astype(int)
+    return {int(year): float(total) for year, total in frame["value"].groupby(years).sum().items()}
+
+
+def baseline(history: list[dict] | None = None) -> tuple[pd.Period, np.ndarray]:
+    """Devuelve el último mes histórico (ancla) y los doce meses que terminan en él."""
+    history = _history(history)
+    if len(history) < MONTHS_PER_YEAR:
+        raise ValueError("Se requieren al menos doce meses de histórico para proyectar.")
+    anchor = pd.Period(history[-1]["date"], freq="M")
+    base = np.array([row["value"] for row in history[-MONTHS_PER_YEAR:]], dtype=float)
+    return anchor, base
+
+
+def scenario_rates(ipc_rate, growth_factor) -> np.ndarray:
+    """Tasa anual efectiva de cada escenario, con forma ``(..., 3)``.
+
+    ``ipc_rate`` y ``growth_factor`` están en puntos porcentuales y pueden ser
+    escalares o arreglos que se difunden entre sí.
+    """
+    ipc = np.asarray(ipc_rate, dtype=float)[..., None] / 100
+    growth = (np.asarray(growth_factor, dtype=float)[..., None] + SCENARIO_GROWTH_SHIFT) / 100
+    return (1 + ipc) * (1 + growth) - 1
+
+
+def project_monthly(base: np.ndarray, rates: np.ndarray, years: int) -> np.ndarray:
+    """Proyecta la estacionalidad ``base`` con las tasas anuales ``rates``.
+
+    ``base`` tiene forma ``(..., 12)`` y ``rates`` forma ``(..., S)``; el
+    resultado tiene forma ``(..., S, years * 12)``.
+    """
+    factors = (1 + rates)[..., None] ** np.arange(1, years + 1)
+    monthly = factors[..., None] * base[..., None, None, :]
+    return monthly.reshape(*monthly.shape[:-2], years * MONTHS_PER_YEAR)
+
+
+def annual_rollup(monthly: np.ndarray) -> np.ndarray:
+    """Agrega una serie mensual ``(..., meses)`` en bloques de doce meses."""
+    return monthly.reshape(*monthly.shape[:-1], -1, MONTHS_PER_YEAR).sum(axis=-1)
+
+
+def year_labels(anchor: pd.Period, start: int, stop: int) -> list[str]:
+    """Etiquetas de los bloques anuales ``start..stop-1`` contados desde el ancla.
+
+    Los bloques son de doce meses y terminan en el mes del ancla, así que solo
+    coinciden con años calendario cuando el ancla es diciembre.
+    """
+    return [format_year_block(anchor.year, anchor.month, offset) for offset in range(start, stop)]
+
+
+def monthly_labels(anchor: pd.Period, months: int) -> pd.Index:
+    """Etiquetas ``YYYY-MM`` de los ``months`` meses siguientes al ancla."""
+    return pd.period_range(anchor + 1, periods=months, freq="M").strftime("%Y-%m")
+
+
+def projection_frames(anchor: pd.Period, base: np.ndarray, monthly: np.ndarray) -> Projections:
+    """Arma los DataFrames columnares a partir del arreglo ``(3, meses)``."""
+    annual = annual_rollup(monthly)
+    years = annual.shape[-1]
+    labels = year_labels(anchor, 0, years + 1)
+    annual_frame = pd.DataFrame(
+        dict(zip(SCENARIOS, np.hstack([np.full((len(SCENARIOS), 1), base.sum()), annual]))),
+        index=pd.Index(labels, name="year"),
+    ).reset_index()
+    dates = monthly_labels(anchor, monthly.shape[-1])
+    monthly_frame = pd.DataFrame(dict(zip(SCENARIOS, monthly)), index=pd.Index(dates, name="date")).reset_index()
+    return Projections(annual_frame, monthly_frame)
+
+
+def generate_projections(
+    ipc_rate: float, growth_factor: float, years_to_project: int, history: list[dict] | None = None
+) -> Projections:
+    """Proyecciones anual y mensual de los tres escenarios.
+
+    La fila anual inicial corresponde al año del ancla histórica (mismo valor en
+    los tres escenarios); la serie mensual empieza el mes siguiente al ancla.
+    """
+    anchor, base = baseline(history)
+    monthly = project_monthly(base, scenario_rates(ipc_rate, growth_factor), years_to_project)
+    return projection_frames(anchor, base, monthly)
@@ -0,0 +1,45 @@
+"""Formato de cifras para tarjetas y tablas.
+
+Vive aparte de :mod:`utils.finance` para que la primera pintura de la app pueda
+formatear los indicadores sin importar NumPy ni pandas.
+"""
+
+
+def format_currency(value: float) -> str:
+    """Formatea un valor en pesos colombianos, p. ej. ``$ 1.234.567``."""
+    sign = "-" if value < 0 else ""
+    return f"{sign}$ {abs(value):,.0f}".replace(",", ".")
+
+
+def format_percentage(value: float) -> str:
+    """Formatea una fracción como porcentaje con dos decimales."""
+    return f"{value * 100:.2f}%"
+
+
+def format_payback(months: float) -> str:
+    """Plazo de recuperación en años y meses; ``inf`` significa que no ocurre en el horizonte."""
+    if months == float("inf"):
+        return "Fuera del horizonte"
+    return f"{months / 12:.1f} años ({int(months)} meses)"
+
+
+MONTH_ABBREVIATIONS = ("ene", "feb", "mar", "abr", "may", "jun", "jul", "ago", "sep", "oct", "nov", "dic")
+
+
+def format_year_block(anchor_year: int, anchor_month: int, offset: int) -> str:
+    """Etiqueta del bloque de doce meses que termina ``offset`` años después del ancla.
+
+    Con el ancla en diciembre los bloques son años calendario (``"2027"``); si
+    no, se rotulan con su primer y último mes (``"abr 2026–mar 2027"``).
+    """
+    end_year = anchor_year + offset
+    if anchor_month == 12:
+        return str(end_year)
+    return f"{MONTH_ABBREVIATIONS[anchor_month]} {end_year - 1}–{MONTH_ABBREVIATIONS[anchor_month - 1]} {end_year}"
+
+
+def format_horizon(anchor_year: int, anchor_month: int, years: int) -> str:
+    """Período cubierto por los ``years`` bloques proyectados, p. ej. ``"2026-2035"``."""
+    if anchor_month == 12:
+        return f"{anchor_year + 1}-{anchor_year + years}"
+    return f"{MONTH_ABBREVIATIONS[anchor_month]} {anchor_year}–{MONTH_ABBREVIATIONS[anchor_month - 1]} {anchor_year + years}"
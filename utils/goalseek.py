@@ -0,0 +1,88 @@
+"""Búsqueda de metas: IPC o crecimiento necesarios para una rentabilidad objetivo.
+
+Responde la pregunta inversa al dashboard ("¿qué crecimiento orgánico
+necesitamos para llegar a X % de rentabilidad acumulada en N años?"). Tanto la
+rentabilidad acumulada como los ingresos del año final crecen con la tasa anual
+``(1 + IPC)(1 + crecimiento) - 1``, así que son monótonas en cada parámetro y
+la meta tiene una sola solución si está dentro del intervalo de búsqueda.
+
+La búsqueda es una bisección de ``POINTS`` puntos: en cada paso se evalúa el
+modelo de proyección sobre ``POINTS`` candidatos por problema a la vez y el
+intervalo se reduce al tramo donde se cruza la meta. Resolver muchos problemas
+en paralelo (uno por cada IPC de la retícula) da la curva de iso-rentabilidad.
+"""
+
+import numpy as np
+
+from utils.finance import SCENARIOS, scenario_rates
+
+TARGETS = ("cumulative_yield", "final_revenue")
+PARAMETERS = ("growth", "ipc")
+
+# Intervalo de búsqueda en puntos porcentuales; fuera de él la meta se considera inalcanzable.
+SEARCH_BOUNDS = (-50.0, 200.0)
+POINTS = 64
+
+
+def target_metric(
+    ipc_rate: np.ndarray,
+    growth_factor: np.ndarray,
+    scenario: str,
+    years_to_project: int,
+    target: str,
+    base: np.ndarray,
+    initial_investment: float,
+) -> np.ndarray:
+    """Rentabilidad acumulada (fracción) o ingresos del año final para arreglos de parámetros."""
+    rates = scenario_rates(ipc_rate, growth_factor)[..., SCENARIOS.index(scenario)]
+    # Igual a ``annual_rollup(project_monthly(...))``: cada año es la base anual por el factor acumulado.
+    annual = (1 + rates)[..., None] ** np.arange(1, years_to_project + 1) * base.sum()
+    if target == "cumulative_yield":
+        return annual.sum(axis=-1) / initial_investment
+    if target == "final_revenue":
+        return annual[..., -1]
+    raise ValueError(f"Meta no soportada: {target!r}")
+
+
+def solve(
+    target: str,
+    value: float,
+    scenario: str,
+    years_to_project: int,
+    solve_for: str,
+    fixed: float | np.ndarray,
+    base: np.ndarray,
+    initial_investment: float,
+    tol: float = 1e-6,
+    max_iter: int = 20,
+) -> np.ndarray:
+    """Valor de ``solve_for`` (``"growth"`` o ``"ipc"``) que alcanza la meta con el otro parámetro en ``fixed``.
+
+    ``fixed`` puede ser un arreglo para resolver varios problemas a la vez.
+    Devuelve ``nan`` donde la meta no se alcanza dentro de :data:`SEARCH_BOUNDS`.
+    """
+    if solve_for not in PARAMETERS:
+        raise ValueError(f"Parámetro no soportado: {solve_for!r}")
+    fixed = np.asarray(fixed, dtype=float)
+
+    def evaluate(candidates: np.ndarray) -> np.ndarray:
+        other = fixed[..., None]
+        if solve_for == "growth":
+            return target_metric(other, candidates, scenario, years_to_project, target, base, initial_investment)
+        return target_metric(candidates, other, scenario, years_to_project, target, base, initial_investment)
+
+    lo = np.full(fixed.shape, SEARCH_BOUNDS[0])
+    hi = np.full(fixed.shape, SEARCH_BOUNDS[1])
+    ends = evaluate(np.stack([lo, hi], axis=-1))
+    reachable = (ends[..., 0] <= value) & (value <= ends[..., 1])
+
+    steps = np.linspace(0, 1, POINTS)
+    for _ in range(max_iter):
+        candidates = lo[..., None] + (hi - lo)[..., None] * steps
+        crossed = evaluate(candidates) >= value
+        upper = np.clip(np.argmax(crossed, axis=-1), 1, POINTS - 1)[..., None]
+        lo = np.take_along_axis(candidates, upper - 1, axis=-1)[..., 0]
+        hi = np.take_along_axis(candidates, upper, axis=-1)[..., 0]
+        if np.max(hi - lo, initial=0) <= tol:
+            break
+    return np.where(reachable, (lo + hi) / 2, np.nan)
@@ -0,0 +1,163 @@
+"""Histórico mensual de solo anexión con agregados incrementales.
+
+Cuando cierra un mes nuevo no hace falta volver a recorrer todo el histórico:
+:meth:`HistoryStore.append` actualiza en O(1) el total anual del año afectado,
+el ancla de proyección (último mes cerrado) y la estacionalidad base. Las
+cachés de valores derivados usan :attr:`HistoryStore.anchor` como parte de su
+clave: como el histórico solo crece por el final, el ancla identifica por
+completo su contenido y solo se recalcula lo que depende de él.
+
+Con la app en marcha, :func:`refresh_history` revisa en cada ejecución el
+``mtime`` del archivo de datos y anexa por ese camino los meses que se
+cerraron desde el arranque, sin reiniciar el proceso.
+"""
+
+import logging
+import threading
+
+import numpy as np
+import pandas as pd
+
+from utils.finance import MONTHS_PER_YEAR, baseline
+
+logger = logging.getLogger(__name__)
+
+
+class HistoryStore:
+    def __init__(self, history: list[dict]):
+        anchor, _ = baseline(history)
+        # Como en :func:`utils.ingest.aggregate_monthly`: la base de doce filas debe
+        # ser de doce meses seguidos y ``months_through`` cuenta posiciones.
+        months = pd.PeriodIndex([row["date"] for row in history], freq="M")
+        if not months.equals(pd.period_range(months[0], periods=len(months), freq="M")):
+            missing = pd.period_range(months[0], months[-1], freq="M").difference(months)
+            if len(missing):
+                raise ValueError(f"Al histórico le faltan meses: {', '.join(missing.strftime('%Y-%m'))}.")
+            raise ValueError("El histórico tiene meses repetidos o fuera de orden.")
+        self._lock = threading.Lock()
+        self.months = [{"date": row["date"], "value": float(row["value"])} for row in history]
+        self.annual: dict[int, float] = {}
+        for row in self.months:
+            year = int(row["date"][:4])
+            self.annual[year] = self.annual.get(year, 0.0) + row["value"]
+        self._anchor = anchor
+
+    @property
+    def anchor(self) -> pd.Period:
+        """Último mes cerrado; las proyecciones arrancan el mes siguiente."""
+        return self._anchor
+
+    @property
+    def latest_closed_year(self) -> int:
+        """Último año calendario con sus doce meses cerrados."""
+        return self._anchor.year if self._anchor.month == MONTHS_PER_YEAR else self._anchor.year - 1
+
+    def append(self, date: str, value: float) -> None:
+        """Anexa el mes siguiente al ancla actual."""
+        period = pd.Period(date, freq="M")
+        with self._lock:
+            if period != self._anchor + 1:
+                raise ValueError(f"Se esperaba el mes {self._anchor + 1}, se recibió {period}.")
+            self.months.append({"date": period.strftime("%Y-%m"), "value": float(value)})
+            self.annual[period.year] = self.annual.get(period.year, 0.0) + float(value)
+            self._anchor = period
+
+    def months_through(self, anchor: pd.Period) -> list[dict]:
+        """Meses del histórico hasta ``anchor`` inclusive."""
+        with self._lock:
+            return self.months[: (anchor - pd.Period(self.months[0]["date"], freq="M")).n + 1]
+
+    def annual_through(self, year: int) -> dict[int, float]:
+        """Copia de los totales anuales hasta ``year`` inclusive, tomada bajo el candado de :meth:`append`."""
+        with self._lock:
+            return {key: total for key, total in self.annual.items() if key <= year}
+
+    def baseline(self) -> tuple[pd.Period, np.ndarray]:
+        """Ancla y doce meses que terminan en ella, como :func:`utils.finance.baseline`."""
+        with self._lock:
+            return self._anchor, np.array([row["value"] for row in self.months[-MONTHS_PER_YEAR:]])
+
+    def latest_year_yield(self, initial_investment: float) -> float:
+        """Rendimiento del último año cerrado sobre la inversión inicial."""
+        return self.annual.get(self.latest_closed_year, 0.0) / initial_investment
+
+
+_store: HistoryStore | None = None
+_store_lock = threading.Lock()
+
+
+def history_store() -> HistoryStore:
+    """Histórico compartido por el proceso, inicializado desde ``constants``."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            from constants import HISTORICAL_DATA
+
+            _store = HistoryStore(HISTORICAL_DATA)
+        return _store
+
+
+def current_store() -> HistoryStore | None:
+    """Histórico compartido si ya se creó en el proceso, sin crearlo."""
+    with _store_lock:
+        return _store
+
+
+def set_history(history: list[dict]) -> HistoryStore:
+    """Reemplaza el histórico compartido, p. ej. al recargar la fuente de datos.
+
+    Las cachés de valores derivados usan el ancla como clave, y un histórico
+    nuevo puede tener la misma ancla con otros valores: se vacían junto con la
+    instantánea de arranque leída por el proceso.
+    """
+    global _store
+    from utils.cache import clear_caches
+    from utils.snapshot import forget_snapshots
+
+    with _store_lock:
+        _store = HistoryStore(history)
+        store = _store
+    clear_caches()
+    forget_snapshots()
+    return store
+
+
+_source_mtime_ns: int | None = None
+_refresh_lock = threading.Lock()
+
+
+def refresh_history() -> bool:
+    """Anexa al histórico compartido los meses nuevos de su archivo; ``True`` si cambió.
+
+    En cada llamada solo se revisa el ``mtime`` de ``constants.HISTORY_SOURCE``.
+    Si cambió, el archivo se vuelve a leer y los meses posteriores al ancla se
+    anexan con :meth:`HistoryStore.append`; si cambiaron meses ya cargados, el
+    histórico se reemplaza con :func:`set_history`. Un archivo inválido se
+    registra una vez y se sigue con el histórico actual.
+    """
+    global _source_mtime_ns
+    import constants
+
+    with _refresh_lock:
+        if _source_mtime_ns is None:
+            _source_mtime_ns = constants.HISTORY_MTIME_NS
+        try:
+            mtime_ns = constants.HISTORY_SOURCE.stat().st_mtime_ns
+        except OSError:
+            return False
+        if mtime_ns == _source_mtime_ns:
+            return False
+        _source_mtime_ns = mtime_ns
+        try:
+            history = constants.load_history()
+            store = history_store()
+            known = store.months_through(store.anchor)
+            if history[: len(known)] != known:
+                set_history(history)
+                return True
+            for row in history[len(known):]:
+                store.append(row["date"], row["value"])
+            return len(history) > len(known)
+        except (OSError, ValueError, KeyError) as error:
+            logger.error("No se pudo actualizar el histórico desde %s: %s", constants.HISTORY_SOURCE, error)
+            return False
@@ -0,0 +1,80 @@
+"""Evaluación incremental de las proyecciones de un par (IPC, crecimiento).
+
+Una :class:`ScenarioSeries` guarda la serie mensual, el consolidado anual y las
+sumas prefijo por escenario hasta el horizonte más largo que se ha pedido.
+Ampliar el horizonte solo calcula los años nuevos y reducirlo es un recorte de
+vista, así que el total acumulado y la proyección final de cualquier horizonte
+y escenario son consultas O(1).
+"""
+
+import threading
+from collections.abc import Callable
+
+import numpy as np
+
+from utils.cube import MAX_YEARS, ProjectionCube
+from utils.finance import MONTHS_PER_YEAR, SCENARIOS, annual_rollup
+
+# Devuelve los meses de los años ``[start, end)`` con forma ``(3, (end - start) * 12)``.
+Source = Callable[[int, int], np.ndarray]
+
+
+def cube_source(cube: ProjectionCube, ipc_rate: float, growth_factor: float) -> Source:
+    """Fuente que lee los años pedidos del cubo precalculado."""
+
+    def read(start: int, end: int) -> np.ndarray:
+        months = cube.monthly_slice(ipc_rate, growth_factor, end)
+        return months[:, start * MONTHS_PER_YEAR:]
+
+    return read
+
+
+class ScenarioSeries:
+    """Serie de los tres escenarios que crece por anexión de años.
+
+    Los arreglos se reservan para ``capacity`` años y solo se escriben más allá
+    del horizonte ya calculado, por lo que las vistas entregadas a otras
+    sesiones nunca cambian.
+    """
+
+    def __init__(self, source: Source, capacity: int = MAX_YEARS):
+        self._source = source
+        self._lock = threading.Lock()
+        self.capacity = capacity
+        self.years = 0
+        self._monthly = np.empty((len(SCENARIOS), capacity * MONTHS_PER_YEAR))
+        self._annual = np.empty((len(SCENARIOS), capacity))
+        self._prefix = np.zeros((len(SCENARIOS), capacity + 1))
+
+    def ensure(self, years: int) -> "ScenarioSeries":
+        """Amplía la serie hasta ``years`` años calculando solo los que faltan."""
+        if years > self.capacity:
+            raise ValueError(f"El horizonte máximo es de {self.capacity} años.")
+        if years <= self.years:
+            return self
+        with self._lock:
+            start = self.years
+            if years > start:
+                # El cubo es ``float32``: se pasa a ``float64`` antes de sumar, como hace
+                # ``projection_frames``, para que las tarjetas cuadren con la tabla y el gráfico.
+                months = self._source(start, years).astype(float)
+                annual = annual_rollup(months)
+                self._monthly[:, start * MONTHS_PER_YEAR: years * MONTHS_PER_YEAR] = months
+                self._annual[:, start:years] = annual
+                self._prefix[:, start + 1: years + 1] = self._prefix[:, start: start + 1] + np.cumsum(annual, axis=1)
+                self.years = years
+        return self
+
+    def monthly(self, years: int) -> np.ndarray:
+        return self.ensure(years)._monthly[:, : years * MONTHS_PER_YEAR]
+
+    def annual(self, years: int) -> np.ndarray:
+        return self.ensure(years)._annual[:, :years]
+
+    def cumulative(self, scenario: str, years: int) -> float:
+        """Ingresos acumulados del escenario en los primeros ``years`` años proyectados."""
+        return float(self.ensure(years)._prefix[SCENARIOS.index(scenario), years])
+
+    def final(self, scenario: str, years: int) -> float:
+        """Ingresos del último año proyectado del escenario."""
+        return float(self.ensure(years)._annual[SCENARIOS.index(scenario), years - 1])
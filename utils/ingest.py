@@ -0,0 +1,112 @@
+"""Carga en streaming de exportaciones de ingresos del PMS.
+
+Las exportaciones diarias de reservas e ingresos (CSV o Parquet) pueden tener
+millones de filas. Se leen por bloques y cada bloque se reduce de inmediato a
+totales mensuales, así que la memoria queda acotada por el número de meses y no
+por el de filas. El resultado agregado se guarda en un Parquet columnar bajo
+``.cache`` identificado por el hash y el ``mtime`` del archivo fuente; mientras
+el archivo no cambie, los arranques siguientes no vuelven a leerlo.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import NamedTuple
+
+import pandas as pd
+
+from utils.finance import calculate_annual_aggregates
+from utils.store import CACHE_DIR
+
+CHUNK_ROWS = 1_000_000
+MANIFEST_FILE = CACHE_DIR / "ingest_manifest.json"
+
+
+class RevenueHistory(NamedTuple):
+    monthly: list[dict]
+    annual: dict[int, float]
+
+
+def _file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as fh:
+        for block in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _source_digest(path: Path, stat: os.stat_result) -> str:
+    """Hash del archivo, reutilizando el del manifiesto si tamaño y ``mtime`` no cambiaron."""
+    manifest = json.loads(MANIFEST_FILE.read_text()) if MANIFEST_FILE.exists() else {}
+    entry = manifest.get(str(path))
+    if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+        return entry["sha256"]
+    digest = _file_digest(path)
+    manifest[str(path)] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest}
+    _write_atomic(MANIFEST_FILE, lambda fh: fh.write(json.dumps(manifest, indent=2).encode()))
+    return digest
+
+
+def _write_atomic(path: Path, write) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=path.parent, suffix=path.suffix, delete=False) as fh:
+        write(fh)
+    os.chmod(fh.name, 0o644)
+    os.replace(fh.name, path)
+
+
+def _chunks(path: Path, date_column: str, value_column: str, chunk_rows: int):
+    if path.suffix.lower() == ".parquet":
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows, columns=[date_column, value_column]):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, usecols=[date_column, value_column], chunksize=chunk_rows)
+
+
+def aggregate_monthly(
+    path: Path, date_column: str = "date", value_column: str = "revenue", chunk_rows: int = CHUNK_ROWS
+) -> pd.Series:
+    """Totales mensuales indexados por ``YYYY-MM``, leyendo el archivo por bloques.
+
+    Las proyecciones toman los últimos doce meses como estacionalidad base, así
+    que una exportación vacía o con meses sin ninguna fila se rechaza en lugar
+    de correr los meses o inventar ceros.
+    """
+    totals = pd.Series(dtype=float)
+    for chunk in _chunks(path, date_column, value_column, chunk_rows):
+        months = pd.to_datetime(chunk[date_column]).dt.to_period("M")
+        totals = totals.add(chunk[value_column].astype(float).groupby(months).sum(), fill_value=0)
+    if totals.empty:
+        raise ValueError(f"La exportación {path} no tiene filas.")
+    totals.index = pd.PeriodIndex(totals.index, freq="M")
+    totals = totals.sort_index()
+    missing = pd.period_range(totals.index[0], totals.index[-1], freq="M").difference(totals.index)
+    if len(missing):
+        raise ValueError(f"A la exportación {path} le faltan meses: {', '.join(missing.strftime('%Y-%m'))}.")
+    totals.index = totals.index.strftime("%Y-%m")
+    return totals
+
+
+def load_revenue_export(
+    path: str | Path, date_column: str = "date", value_column: str = "revenue", chunk_rows: int = CHUNK_ROWS
+) -> RevenueHistory:
+    """Histórico mensual ``{date, value}`` y anual de una exportación del PMS."""
+    path = Path(path).resolve()
+    stat = path.stat()
+    digest = _source_digest(path, stat)
+    # ``v2``: los agregados anteriores podían tener meses faltantes sin validar.
+    cached = CACHE_DIR / f"history-v2-{digest[:16]}-{stat.st_mtime_ns}-{date_column}-{value_column}.parquet"
+
+    if cached.exists():
+        frame = pd.read_parquet(cached)
+    else:
+        totals = aggregate_monthly(path, date_column, value_column, chunk_rows)
+        frame = pd.DataFrame({"date": totals.index, "value": totals.to_numpy()})
+        _write_atomic(cached, lambda fh: frame.to_parquet(fh, index=False))
+
+    monthly = [{"date": date, "value": float(value)} for date, value in zip(frame["date"], frame["value"])]
+    return RevenueHistory(monthly, calculate_annual_aggregates(monthly))
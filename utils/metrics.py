@@ -0,0 +1,229 @@
+"""Instrumentación por ejecución del dashboard y exportación en formato Prometheus.
+
+Cada ejecución del script abre una :class:`Rerun` y envuelve en
+:meth:`Rerun.span` el cálculo de cada valor derivado. El tramo registra su
+duración, la clave de parámetros y si la caché acertó o falló; los tramos de la
+ejecución actual alimentan el panel de depuración de la app y, además, se
+acumulan en contadores e histogramas del proceso que se exportan en texto de
+Prometheus por HTTP local (``NAO_METRICS_PORT``) o a un archivo
+(``NAO_METRICS_FILE``). La clave de parámetros no se usa como etiqueta de
+Prometheus para no disparar la cardinalidad.
+"""
+
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from utils.cache import cache_stats, last_lookup_hit, reset_last_lookup
+
+logger = logging.getLogger(__name__)
+
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(BUCKETS):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.total += value
+
+
+class Registry:
+    """Contadores e histogramas del proceso, etiquetados por etapa."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stage_seconds: dict[str, Histogram] = {}
+        self.stage_calls: dict[tuple[str, str], int] = {}
+        self.gauges: dict[str, float] = {}
+
+    def observe(self, stage: str, seconds: float, cache: str) -> None:
+        with self._lock:
+            self.stage_seconds.setdefault(stage, Histogram()).observe(seconds)
+            self.stage_calls[stage, cache] = self.stage_calls.get((stage, cache), 0) + 1
+
+    def set_gauge(self, name: str, value: float) -> None:
+        with self._lock:
+            self.gauges[name] = value
+
+    def stage_totals(self) -> dict[str, tuple[int, float]]:
+        """Ejecuciones y segundos acumulados por etapa, copiados bajo el candado."""
+        with self._lock:
+            return {stage: (sum(h.counts), h.total) for stage, h in sorted(self.stage_seconds.items())}
+
+    def render(self) -> str:
+        """Exposición en formato de texto de Prometheus."""
+        lines = [
+            "# HELP nao_stage_seconds Duración del cálculo de cada valor derivado por ejecución.",
+            "# TYPE nao_stage_seconds histogram",
+        ]
+        with self._lock:
+            for stage, histogram in sorted(self.stage_seconds.items()):
+                cumulative = 0
+                for bound, count in zip((*BUCKETS, "+Inf"), histogram.counts):
+                    cumulative += count
+                    lines.append(f'nao_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+                lines.append(f'nao_stage_seconds_sum{{stage="{stage}"}} {histogram.total}')
+                lines.append(f'nao_stage_seconds_count{{stage="{stage}"}} {cumulative}')
+            lines += ["# HELP nao_stage_total Cálculos por etapa y resultado de caché.", "# TYPE nao_stage_total counter"]
+            for (stage, cache), count in sorted(self.stage_calls.items()):
+                lines.append(f'nao_stage_total{{stage="{stage}",cache="{cache}"}} {count}')
+            for name, value in sorted(self.gauges.items()):
+                lines += [f"# TYPE {name} gauge", f"{name} {value}"]
+
+        counters = (("hits", "Aciertos"), ("misses", "Fallos"), ("evictions", "Desalojos"), ("expirations", "Expiraciones"))
+        stats = cache_stats()
+        for attribute, description in counters:
+            lines += [f"# HELP nao_cache_{attribute}_total {description} por caché.", f"# TYPE nao_cache_{attribute}_total counter"]
+            lines += [f'nao_cache_{attribute}_total{{cache="{name}"}} {getattr(s, attribute)}' for name, s in stats.items()]
+        lines += ["# TYPE nao_cache_size gauge"]
+        lines += [f'nao_cache_size{{cache="{name}"}} {s.size}' for name, s in stats.items()]
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+@dataclass
+class Span:
+    stage: str
+    key: tuple
+    cache: str
+    seconds: float
+
+
+def process_uptime() -> float | None:
+    """Segundos desde que arrancó el proceso según ``/proc``, o ``None`` fuera de Linux."""
+    try:
+        fields = Path("/proc/self/stat").read_text().rsplit(")", 1)[1].split()
+        uptime = float(Path("/proc/uptime").read_text().split()[0])
+        return uptime - int(fields[19]) / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+# Hitos de la primera ejecución del proceso (arranque en frío), en segundos.
+STARTUP: dict[str, float] = {}
+_startup_lock = threading.Lock()
+
+
+@dataclass
+class Rerun:
+    """Tramos e hitos medidos durante una ejecución del script."""
+
+    spans: list[Span] = field(default_factory=list)
+    checkpoints: dict[str, float] = field(default_factory=dict)
+    started: float = field(default_factory=time.perf_counter)
+
+    @contextmanager
+    def span(self, stage: str, key: tuple = ()):
+        reset_last_lookup()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            hit = last_lookup_hit()
+            cache = "none" if hit is None else ("hit" if hit else "miss")
+            self.spans.append(Span(stage, key, cache, seconds))
+            REGISTRY.observe(stage, seconds, cache)
+
+    def checkpoint(self, phase: str) -> float:
+        """Segundos desde el inicio de la ejecución hasta ``phase`` (p. ej. la primera pintura).
+
+        La primera vez que el proceso alcanza cada hito se guarda en
+        :data:`STARTUP` y se exporta como medida de arranque en frío, junto con
+        el tiempo transcurrido desde que arrancó el proceso.
+        """
+        seconds = time.perf_counter() - self.started
+        self.checkpoints[phase] = seconds
+        REGISTRY.observe(phase, seconds, "none")
+        with _startup_lock:
+            if phase not in STARTUP:
+                STARTUP[phase] = seconds
+                REGISTRY.set_gauge(f"nao_startup_{phase}_seconds", seconds)
+                uptime = process_uptime()
+                if uptime is not None:
+                    REGISTRY.set_gauge(f"nao_startup_{phase}_process_uptime_seconds", uptime)
+        return seconds
+
+    def finish(self) -> float:
+        """Cierra la ejecución, la registra y exporta las métricas si está configurado."""
+        seconds = self.checkpoint("rerun")
+        REGISTRY.set_gauge("nao_last_rerun_seconds", seconds)
+        export()
+        return seconds
+
+
+def write_metrics_file(path: str | Path) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile("w", dir=path.parent, suffix=".prom", delete=False) as fh:
+        fh.write(REGISTRY.render())
+    os.chmod(fh.name, 0o644)
+    os.replace(fh.name, path)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.rstrip("/") != "/metrics":
+            self.send_error(404)
+            return
+        body = REGISTRY.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server: ThreadingHTTPServer | None = None
+_server_failed = False
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer | None:
+    """Sirve ``/metrics`` en un hilo de fondo; solo se intenta una vez por proceso.
+
+    Si el puerto no se puede abrir (p. ej. otro proceso de la misma máquina ya
+    lo usa) se registra el error una sola vez y se devuelve ``None``: las
+    métricas no deben romper la página.
+    """
+    global _server, _server_failed
+    with _server_lock:
+        if _server is None and not _server_failed:
+            try:
+                _server = ThreadingHTTPServer((host, port), _Handler)
+            except OSError as error:
+                _server_failed = True
+                logger.error("No se pudo servir /metrics en %s:%s: %s", host, port, error)
+                return None
+            threading.Thread(target=_server.serve_forever, name="nao-metrics", daemon=True).start()
+        return _server
+
+
+def export() -> None:
+    """Publica las métricas según ``NAO_METRICS_PORT`` y ``NAO_METRICS_FILE``."""
+    port = os.environ.get("NAO_METRICS_PORT")
+    if port:
+        start_metrics_server(int(port))
+    path = os.environ.get("NAO_METRICS_FILE")
+    if path:
+        write_metrics_file(path)
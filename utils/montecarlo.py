@@ -0,0 +1,136 @@
+"""Modo estocástico: simulación Monte Carlo de trayectorias de IPC y crecimiento.
+
+Cada trayectoria sortea un IPC y un crecimiento orgánico por año de proyección.
+Como los ingresos mensuales son la estacionalidad base por un factor anual
+acumulado, basta simular la matriz de factores ``(trayectoria, año)``; los
+percentiles mensuales y anuales se obtienen escalando los percentiles de esos
+factores, lo cual es exacto porque la estacionalidad base es positiva.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from utils.finance import MONTHS_PER_YEAR, baseline, monthly_labels, year_labels
+from utils.returns import return_metrics
+
+PERCENTILES = (5, 25, 50, 75, 95)
+BAND_COLUMNS = tuple(f"p{p}" for p in PERCENTILES)
+
+# A partir de este número de trayectorias la simulación se reparte en procesos.
+POOL_THRESHOLD = 200_000
+CHUNK_SIZE = 100_000
+
+# Trayectorias por bloque al expandir los factores a flujos mensuales para VPN/TIR.
+RETURNS_CHUNK = 8_192
+
+
+@dataclass(frozen=True)
+class Distribution:
+    """Distribución de una tasa anual en puntos porcentuales.
+
+    ``kind`` puede ser ``"normal"`` (``params = (media, desviación)``),
+    ``"uniform"`` (``params = (mínimo, máximo)``) o ``"triangular"``
+    (``params = (mínimo, moda, máximo)``).
+    """
+
+    kind: str
+    params: tuple[float, ...]
+
+    def sample(self, rng: np.random.Generator, size: tuple[int, ...]) -> np.ndarray:
+        if self.kind == "normal":
+            return rng.normal(*self.params, size=size)
+        if self.kind == "uniform":
+            return rng.uniform(*self.params, size=size)
+        if self.kind == "triangular":
+            return rng.triangular(*self.params, size=size)
+        raise ValueError(f"Distribución no soportada: {self.kind!r}")
+
+
+@dataclass(frozen=True)
+class MonteCarloConfig:
+    ipc: Distribution
+    growth: Distribution
+    paths: int = 50_000
+    seed: int | None = None
+    workers: int | None = field(default=None, compare=False)
+
+
+class FanBands(NamedTuple):
+    annual: pd.DataFrame
+    monthly: pd.DataFrame
+    cumulative: pd.DataFrame
+
+
+def simulate_factors(ipc: Distribution, growth: Distribution, paths: int, years: int, seed) -> np.ndarray:
+    """Factores de crecimiento acumulados con forma ``(paths, years)``."""
+    rng = np.random.default_rng(seed)
+    rates = (1 + ipc.sample(rng, (paths, years)) / 100) * (1 + growth.sample(rng, (paths, years)) / 100)
+    return np.cumprod(rates, axis=1)
+
+
+def _simulate(config: MonteCarloConfig, years: int) -> np.ndarray:
+    if config.paths < POOL_THRESHOLD:
+        return simulate_factors(config.ipc, config.growth, config.paths, years, config.seed)
+
+    sizes = [CHUNK_SIZE] * (config.paths // CHUNK_SIZE)
+    if config.paths % CHUNK_SIZE:
+        sizes.append(config.paths % CHUNK_SIZE)
+    seeds = np.random.SeedSequence(config.seed).spawn(len(sizes))
+    with ProcessPoolExecutor(max_workers=config.workers or os.cpu_count()) as pool:
+        chunks = pool.map(
+            simulate_factors,
+            [config.ipc] * len(sizes), [config.growth] * len(sizes), sizes, [years] * len(sizes), seeds,
+        )
+        return np.concatenate([chunk.astype(np.float32) for chunk in chunks])
+
+
+def simulate_bands(config: MonteCarloConfig, years_to_project: int, history: list[dict] | None = None) -> FanBands:
+    """Bandas P5/P25/P50/P75/P95 de ingresos anuales, mensuales y acumulados."""
+    anchor, base = baseline(history)
+    factors = _simulate(config, years_to_project)
+    factor_bands = np.percentile(factors, PERCENTILES, axis=0)
+    cumulative_bands = np.percentile(np.cumsum(factors, axis=1), PERCENTILES, axis=0) * base.sum()
+
+    years = pd.Index(year_labels(anchor, 1, years_to_project + 1), name="year")
+    monthly = (factor_bands[:, :, None] * base).reshape(len(PERCENTILES), years_to_project * MONTHS_PER_YEAR)
+    return FanBands(
+        annual=pd.DataFrame(dict(zip(BAND_COLUMNS, factor_bands * base.sum())), index=years).reset_index(),
+        monthly=pd.DataFrame(
+            dict(zip(BAND_COLUMNS, monthly)), index=pd.Index(monthly_labels(anchor, monthly.shape[-1]), name="date")
+        ).reset_index(),
+        cumulative=pd.DataFrame(dict(zip(BAND_COLUMNS, cumulative_bands)), index=years).reset_index(),
+    )
+
+
+def simulate_return_bands(
+    config: MonteCarloConfig,
+    years_to_project: int,
+    initial_investment: float,
+    discount_rate: float,
+    history: list[dict] | None = None,
+) -> pd.DataFrame:
+    """Percentiles de VPN, TIR y mes de recuperación, con una fila por percentil.
+
+    Los flujos mensuales se arman por bloques de trayectorias para no
+    materializar la matriz ``(trayectoria, mes)`` completa.
+    """
+    _, base = baseline(history)
+    factors = _simulate(config, years_to_project)
+    blocks = []
+    for start in range(0, len(factors), RETURNS_CHUNK):
+        flows = (factors[start:start + RETURNS_CHUNK, :, None] * base).reshape(-1, years_to_project * MONTHS_PER_YEAR)
+        blocks.append(return_metrics(flows, initial_investment, discount_rate))
+    npv, irr, payback = (np.concatenate(metric) for metric in zip(*blocks))
+    return pd.DataFrame(
+        {
+            "npv": np.percentile(npv, PERCENTILES),
+            "irr": np.nanpercentile(irr, PERCENTILES),
+            "payback": np.percentile(payback, PERCENTILES, method="higher"),
+        },
+        index=pd.Index(BAND_COLUMNS, name="percentile"),
+    )
@@ -0,0 +1,134 @@
+"""Proyecciones de un portafolio de unidades en varias propiedades.
+
+Cada unidad tiene su inversión, su estacionalidad base (doce meses que terminan
+en el ancla común) y opcionalmente su propio IPC y crecimiento. Todo el
+portafolio se proyecta en una sola operación 2-D: los factores anuales
+``(unidad, escenario, año)`` se calculan de una vez y los ingresos mensuales
+salen de multiplicarlos por la estacionalidad de cada unidad. Las
+agregaciones por propiedad o propietario reducen por grupos sin recorrer las
+unidades en Python.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from utils.finance import MONTHS_PER_YEAR, SCENARIOS, monthly_labels, scenario_rates, year_labels
+
+UNIT_COLUMNS = ("unit_id", "property", "owner", "investment")
+
+
+class Portfolio(NamedTuple):
+    """Unidades del portafolio.
+
+    ``units`` tiene las columnas ``unit_id``, ``property``, ``owner``,
+    ``investment`` y opcionalmente ``ipc_rate`` y ``growth_factor`` (vacías
+    para usar los valores generales). ``base`` tiene forma ``(unidades, 12)``.
+    """
+
+    units: pd.DataFrame
+    base: np.ndarray
+    anchor: pd.Period
+
+
+class PortfolioProjection(NamedTuple):
+    portfolio: Portfolio
+    factors: np.ndarray  # (unidad, escenario, año)
+
+    @property
+    def annual(self) -> np.ndarray:
+        """Ingresos anuales ``(unidad, escenario, año)``."""
+        return self.factors * self.portfolio.base.sum(axis=1)[:, None, None]
+
+    def monthly(self, units: np.ndarray | slice = slice(None)) -> np.ndarray:
+        """Ingresos mensuales ``(unidad, escenario, mes)`` de las unidades pedidas."""
+        factors = self.factors[units]
+        base = self.portfolio.base[units]
+        monthly = factors[..., None] * base[:, None, None, :]
+        return monthly.reshape(*factors.shape[:-1], -1)
+
+    def _groups(self, by: str) -> tuple[pd.Index, np.ndarray, np.ndarray]:
+        """Grupos, orden de unidades agrupadas e inicio de cada grupo para ``reduceat``."""
+        codes, groups = pd.factorize(self.portfolio.units[by], sort=True)
+        order = np.argsort(codes, kind="stable")
+        return groups, order, np.searchsorted(codes[order], np.arange(len(groups)))
+
+    def aggregate(self, by: str) -> pd.DataFrame:
+        """Ingresos anuales e inversión sumados por ``property`` u ``owner``.
+
+        Devuelve una fila por grupo, escenario y año.
+        """
+        groups, order, starts = self._groups(by)
+        annual = self.annual
+        totals = np.add.reduceat(annual[order], starts, axis=0)
+        investment = np.add.reduceat(self.portfolio.units["investment"].to_numpy(float)[order], starts)
+        years = year_labels(self.portfolio.anchor, 1, annual.shape[-1] + 1)
+        index = pd.MultiIndex.from_product([groups, SCENARIOS, years], names=[by, "scenario", "year"])
+        frame = pd.DataFrame({"revenue": totals.ravel()}, index=index).reset_index()
+        frame["investment"] = np.repeat(investment, len(SCENARIOS) * len(years))
+        frame["yield"] = frame["revenue"] / frame["investment"]
+        return frame
+
+    def group_monthly(self, by: str) -> tuple[pd.Index, np.ndarray]:
+        """Ingresos mensuales ``(grupo, escenario, mes)`` sumados por ``property`` u ``owner``."""
+        groups, order, starts = self._groups(by)
+        return groups, np.add.reduceat(self.monthly(order), starts, axis=0)
+
+    def unit(self, unit_id) -> pd.DataFrame:
+        """Detalle mensual de una unidad con una columna por escenario."""
+        position = np.flatnonzero(self.portfolio.units["unit_id"].to_numpy() == unit_id)
+        if not len(position):
+            raise KeyError(unit_id)
+        monthly = self.monthly(position)[0]
+        dates = monthly_labels(self.portfolio.anchor, monthly.shape[-1])
+        return pd.DataFrame(dict(zip(SCENARIOS, monthly)), index=pd.Index(dates, name="date")).reset_index()
+
+
+def _read_table(path) -> pd.DataFrame:
+    return pd.read_parquet(path) if str(path).lower().endswith(".parquet") else pd.read_csv(path)
+
+
+def load_portfolio_files(units_path, history_path) -> Portfolio:
+    """Lee unidades e histórico desde CSV o Parquet y arma el portafolio."""
+    history = _read_table(history_path).astype({"date": str})
+    return load_portfolio(_read_table(units_path), history)
+
+
+def load_portfolio(units: pd.DataFrame, history: pd.DataFrame) -> Portfolio:
+    """Arma el portafolio a partir de las unidades y su histórico en formato largo.
+
+    ``history`` tiene columnas ``unit_id``, ``date`` (``YYYY-MM``) y ``value``;
+    la estacionalidad base de cada unidad son los doce meses que terminan en el
+    último mes del histórico, que es el ancla común del portafolio.
+    """
+    missing = set(UNIT_COLUMNS) - set(units.columns)
+    if missing:
+        raise ValueError(f"Faltan columnas en las unidades: {sorted(missing)}")
+    units = units.reset_index(drop=True)
+    anchor = pd.Period(history["date"].max(), freq="M")
+    months = pd.period_range(anchor - MONTHS_PER_YEAR + 1, anchor, freq="M").strftime("%Y-%m")
+    base = (
+        history[history["date"].isin(months)]
+        .pivot_table(index="unit_id", columns="date", values="value", aggfunc="sum")
+        .reindex(index=units["unit_id"], columns=months)
+    )
+    if base.isna().to_numpy().any():
+        raise ValueError("Cada unidad necesita los doce meses que terminan en el ancla.")
+    return Portfolio(units, base.to_numpy(dtype=float), anchor)
+
+
+def project_portfolio(
+    portfolio: Portfolio, ipc_rate: float, growth_factor: float, years_to_project: int
+) -> PortfolioProjection:
+    """Factores de crecimiento de todas las unidades y escenarios en una operación."""
+    units = portfolio.units
+    ipc = units["ipc_rate"].fillna(ipc_rate).to_numpy(float) if "ipc_rate" in units else np.full(len(units), ipc_rate)
+    growth = (
+        units["growth_factor"].fillna(growth_factor).to_numpy(float)
+        if "growth_factor" in units
+        else np.full(len(units), growth_factor)
+    )
+    rates = scenario_rates(ipc, growth)
+    factors = (1 + rates)[..., None] ** np.arange(1, years_to_project + 1)
+    return PortfolioProjection(portfolio, factors)
@@ -0,0 +1,290 @@
+"""Generador de reportes por lotes, sin interfaz, para muchos juegos de parámetros.
+
+Reproduce para cada juego ``(ipc_rate, growth_factor, years_to_project)`` lo que
+la app muestra al mover los sliders: los indicadores de las tarjetas (incluidos
+VPN, TIR y recuperación), las tablas anual y mensual de los tres escenarios con
+la rentabilidad acumulada desde el primer año proyectado y el gráfico de
+proyección como HTML estático. Reutiliza los valores derivados y los
+formateadores de la app.
+
+Los juegos se reparten en un pool de procesos que abren el mismo cubo con
+``mmap``. Cada proceso escribe sus archivos y devuelve solo la fila de
+indicadores, que se anexa de inmediato al resumen; los juegos se generan de
+forma perezosa y hay un número acotado en vuelo, así que miles de juegos nunca
+están en memoria a la vez. Uso, desde la raíz del repositorio::
+
+    python -m utils.report salida/ --ipc 3 4.5 6 --growth 0 2 --years 10 25
+    python -m utils.report salida/ --sets juegos.csv --format csv --workers 4
+"""
+
+import argparse
+import html
+import itertools
+import os
+import sys
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+import pandas as pd
+
+from utils.cube import grid_point, load_cube
+from utils.finance import SCENARIOS
+from utils.formatting import format_currency, format_horizon, format_payback, format_percentage, format_year_block
+from utils.snapshot import DEFAULT_DISCOUNT_RATE
+
+PLOTLY_BUNDLE = "plotly.min.js"
+SUMMARY_FLUSH_ROWS = 256
+
+# Nombres de columna aceptados en ``--sets``, incluidos los de la versión en React.
+SET_COLUMNS = {"ipcRate": "ipc_rate", "growthFactor": "growth_factor", "yearsToProject": "years_to_project"}
+
+ParameterSet = tuple[float, float, int]
+
+
+def grid_sets(ipc_rates: Iterable[float], growth_factors: Iterable[float], years: Iterable[int]) -> Iterator[ParameterSet]:
+    """Producto cartesiano de los valores de cada slider, generado bajo demanda."""
+    return _normalized(itertools.product(ipc_rates, growth_factors, years))
+
+
+def file_sets(path: Path, chunk_rows: int = 10_000) -> Iterator[ParameterSet]:
+    """Juegos leídos por bloques de un CSV con columnas ``ipc_rate``, ``growth_factor`` y ``years_to_project``."""
+    for chunk in pd.read_csv(path, chunksize=chunk_rows):
+        chunk = chunk.rename(columns=SET_COLUMNS)
+        yield from _normalized(chunk[["ipc_rate", "growth_factor", "years_to_project"]].itertuples(index=False))
+
+
+def _normalized(rows: Iterable[tuple]) -> Iterator[ParameterSet]:
+    """Valida cada juego contra la retícula de los sliders y lo lleva a sus valores exactos.
+
+    Un juego fuera de la retícula es un ``ValueError``: no se redondea a otro
+    juego distinto del pedido.
+    """
+    for row in rows:
+        try:
+            yield grid_point(*row)
+        except ValueError as error:
+            raise ValueError(f"Juego {tuple(row)} fuera de la retícula de los sliders: {error}") from None
+
+
+def slug(parameters: ParameterSet) -> str:
+    ipc_rate, growth_factor, years_to_project = parameters
+    return f"ipc{ipc_rate:.1f}_g{growth_factor:+.1f}_y{years_to_project:02d}"
+
+
+def _write_frame(frame: pd.DataFrame, path: Path, fmt: str) -> None:
+    if fmt == "parquet":
+        frame.to_parquet(path, index=False)
+    else:
+        frame.to_csv(path, index=False)
+
+
+def _chart_page(title: str, kpis: dict[str, str], figure_html: str, table: pd.DataFrame) -> str:
+    cards = "".join(
+        f"<div class='kpi'><span>{html.escape(name)}</span><strong>{html.escape(value)}</strong></div>"
+        for name, value in kpis.items()
+    )
+    return f"""<!DOCTYPE html>
+<html lang="es">
+<head>
+<meta charset="utf-8">
+<title>{html.escape(title)}</title>
+<style>
+body {{ font-family: sans-serif; color: #0f172a; margin: 24px; }}
+.kpis {{ display: flex; gap: 12px; flex-wrap: wrap; }}
+.kpi {{ border: 1px solid #e2e8f0; border-radius: 12px; padding: 12px 16px; }}
+.kpi span {{ display: block; font-size: 11px; font-weight: 700; color: #64748b; text-transform: uppercase; }}
+.kpi strong {{ font-size: 20px; }}
+table {{ border-collapse: collapse; }}
+td, th {{ padding: 4px 12px; border-bottom: 1px solid #e2e8f0; text-align: right; }}
+</style>
+</head>
+<body>
+<h2>{html.escape(title)}</h2>
+<div class="kpis">{cards}</div>
+{figure_html}
+<h3>Tabla Detallada de Rentabilidad</h3>
+{table.to_html(index=False, border=0)}
+</body>
+</html>
+"""
+
+
+def render_set(parameters: ParameterSet, output: str, fmt: str, scenario: str, discount_rate: float) -> dict:
+    """Escribe las tablas y el gráfico de un juego y devuelve su fila de indicadores."""
+    from constants import INITIAL_INVESTMENT
+    from utils import derived
+    from utils.cache import clear_caches
+    from utils.charts import build_figure
+    from utils.history import history_store
+
+    ipc_rate, growth_factor, years_to_project = parameters
+    store = history_store()
+    annual, monthly = derived.projections(*parameters)
+    anchor = store.anchor
+    final_year = anchor.year + years_to_project
+    final_label = format_year_block(anchor.year, anchor.month, years_to_project)
+
+    row = {
+        "ipc_rate": ipc_rate,
+        "growth_factor": growth_factor,
+        "years_to_project": years_to_project,
+        "closed_year": store.latest_closed_year,
+        "closed_year_revenue": store.annual.get(store.latest_closed_year, 0.0),
+        "current_yield": store.latest_year_yield(INITIAL_INVESTMENT),
+        # Año en que termina el último bloque de doce meses (calendario si el ancla es diciembre).
+        "final_year": final_year,
+    }
+    metrics = derived.returns(*parameters, discount_rate)
+    for i, name in enumerate(SCENARIOS):
+        cumulative = derived.cumulative_revenue(*parameters, name)
+        row[f"final_revenue_{name}"] = derived.final_revenue(*parameters, name)
+        row[f"cumulative_revenue_{name}"] = cumulative
+        row[f"cumulative_yield_{name}"] = cumulative / INITIAL_INVESTMENT
+        row[f"npv_{name}"] = float(metrics.npv[i])
+        row[f"irr_{name}"] = float(metrics.irr[i])
+        row[f"payback_months_{name}"] = float(metrics.payback[i])
+
+    directory = Path(output) / slug(parameters)
+    directory.mkdir(parents=True, exist_ok=True)
+    projected = annual.iloc[1:]
+    yields = projected[list(SCENARIOS)].cumsum() / INITIAL_INVESTMENT
+    annual_report = annual.join(yields.add_prefix("cumulative_yield_"))
+    _write_frame(annual_report, directory / f"annual.{fmt}", fmt)
+    _write_frame(monthly.astype({"date": str}), directory / f"monthly.{fmt}", fmt)
+
+    kpis = {
+        f"Ingresos Reales ({row['closed_year']})": format_currency(row["closed_year_revenue"]),
+        "Rendimiento Actual": format_percentage(row["current_yield"]),
+        f"Proyección Final ({final_label})": format_currency(row[f"final_revenue_{scenario}"]),
+        f"Total Acumulado ({format_horizon(anchor.year, anchor.month, years_to_project)})": format_currency(
+            row[f"cumulative_revenue_{scenario}"]
+        ),
+        "Rentabilidad Acumulada": format_percentage(row[f"cumulative_yield_{scenario}"]),
+        f"VPN al {discount_rate:.1f}%": format_currency(row[f"npv_{scenario}"]),
+        "TIR": format_percentage(row[f"irr_{scenario}"]),
+        "Recuperación": format_payback(row[f"payback_months_{scenario}"]),
+    }
+    figure = build_figure(derived.chart_data(*parameters, "yearly"), "yearly", scenario)
+    figure_html = figure.to_html(full_html=False, include_plotlyjs=f"../{PLOTLY_BUNDLE}")
+    page = _chart_page(
+        f"IPC {ipc_rate:.1f}% · Crecimiento {growth_factor:.1f}% · {years_to_project} años",
+        kpis, figure_html, derived.table(*parameters, "yearly", "value"),
+    )
+    (directory / "chart.html").write_text(page, encoding="utf-8")
+
+    # Cada juego se escribe una sola vez: no tiene sentido conservar sus valores derivados.
+    clear_caches()
+    return row
+
+
+class SummaryWriter:
+    """Anexa filas de indicadores al resumen por bloques, sin acumular todo el lote."""
+
+    def __init__(self, path: Path, fmt: str):
+        self.path = path
+        self.fmt = fmt
+        self._rows: list[dict] = []
+        self._parquet = None
+        self._header = True
+
+    def append(self, row: dict) -> None:
+        self._rows.append(row)
+        if len(self._rows) >= SUMMARY_FLUSH_ROWS:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._rows:
+            return
+        frame = pd.DataFrame(self._rows)
+        self._rows = []
+        if self.fmt == "csv":
+            frame.to_csv(self.path, mode="w" if self._header else "a", header=self._header, index=False)
+            self._header = False
+            return
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        if self._parquet is None:
+            self._parquet = pq.ParquetWriter(self.path, table.schema)
+        self._parquet.write_table(table)
+
+    def close(self) -> None:
+        self.flush()
+        if self._parquet is not None:
+            self._parquet.close()
+
+
+def run(
+    sets: Iterable[ParameterSet],
+    output: Path,
+    fmt: str = "parquet",
+    scenario: str = "moderate",
+    workers: int | None = None,
+    discount_rate: float = DEFAULT_DISCOUNT_RATE,
+) -> int:
+    """Genera los reportes de ``sets`` en ``output`` y devuelve cuántos se escribieron."""
+    import plotly.offline
+
+    cube = load_cube()  # se construye una sola vez; los procesos lo abren con mmap
+    output.mkdir(parents=True, exist_ok=True)
+    (output / PLOTLY_BUNDLE).write_text(plotly.offline.get_plotlyjs(), encoding="utf-8")
+
+    def checked(sets: Iterable[ParameterSet]) -> Iterator[ParameterSet]:
+        for parameters in sets:
+            cube.monthly_slice(*parameters)  # ValueError si el juego no es un valor de los sliders
+            yield parameters
+
+    summary = SummaryWriter(output / f"summary.{fmt}", fmt)
+    done = 0
+    workers = workers or os.cpu_count() or 1
+    try:
+        if workers == 1:
+            for parameters in checked(sets):
+                summary.append(render_set(parameters, str(output), fmt, scenario, discount_rate))
+                done += 1
+            return done
+
+        pending = checked(sets)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            in_flight = set()
+            while True:
+                for parameters in itertools.islice(pending, workers * 4 - len(in_flight)):
+                    in_flight.add(pool.submit(render_set, parameters, str(output), fmt, scenario, discount_rate))
+                if not in_flight:
+                    break
+                finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    summary.append(future.result())
+                    done += 1
+        return done
+    finally:
+        summary.close()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("output", type=Path, help="directorio de salida")
+    parser.add_argument("--ipc", type=float, nargs="+", default=[4.5], help="IPC anual esperado (%%)")
+    parser.add_argument("--growth", type=float, nargs="+", default=[2.0], help="crecimiento orgánico (%%)")
+    parser.add_argument("--years", type=int, nargs="+", default=[10], help="años de proyección")
+    parser.add_argument("--sets", type=Path, help="CSV con un juego por fila; reemplaza --ipc/--growth/--years")
+    parser.add_argument("--format", choices=["parquet", "csv"], default="parquet")
+    parser.add_argument("--scenario", choices=SCENARIOS, default="moderate", help="escenario de las tarjetas")
+    parser.add_argument("--discount-rate", type=float, default=DEFAULT_DISCOUNT_RATE, help="tasa anual del VPN (%%)")
+    parser.add_argument("--workers", type=int, default=None, help="procesos del pool (1 = sin pool)")
+    args = parser.parse_args(argv)
+
+    sets = file_sets(args.sets) if args.sets else grid_sets(args.ipc, args.growth, args.years)
+    try:
+        done = run(sets, args.output, args.format, args.scenario, args.workers, args.discount_rate)
+    except ValueError as error:
+        print(f"Error: {error}", file=sys.stderr)
+        return 1
+    print(f"{done} reportes escritos en {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
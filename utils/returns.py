@@ -0,0 +1,112 @@
+"""Indicadores de retorno con valor del dinero en el tiempo: VPN, TIR y recuperación.
+
+Los flujos son la inversión inicial en el mes del ancla y los ingresos
+proyectados de cada mes siguiente, como en las rentabilidades del dashboard.
+Todas las funciones reciben un arreglo ``(..., meses)`` y resuelven todas las
+series a la vez: un par de sliders ``(3, meses)``, la retícula completa del
+cubo ``(ipc, crecimiento, 3, meses)`` o un bloque de trayectorias de Monte
+Carlo ``(trayectorias, meses)``.
+
+La TIR se obtiene sobre el factor de descuento mensual ``v = 1 / (1 + m)``:
+``v * P(v) - inversión`` es creciente en ``v`` cuando los ingresos no son
+negativos, así que cada serie tiene una sola raíz. Se acota con duplicación y
+se refina con Newton desde la duración media de la serie, con bisección como
+respaldo cuando el paso de Newton sale del intervalo; el polinomio y su
+derivada se evalúan con Horner sobre todas las series en paralelo.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+from utils.finance import MONTHS_PER_YEAR
+
+
+class ReturnMetrics(NamedTuple):
+    npv: np.ndarray
+    irr: np.ndarray
+    # Meses desde el ancla hasta recuperar la inversión; ``inf`` si no ocurre en el horizonte.
+    payback: np.ndarray
+
+
+def monthly_discount(discount_rate: float) -> float:
+    """Factor de descuento mensual equivalente a una tasa anual en puntos porcentuales."""
+    return (1 + discount_rate / 100) ** (-1 / MONTHS_PER_YEAR)
+
+
+def npv(flows: np.ndarray, investment: float, discount_rate: float) -> np.ndarray:
+    """Valor presente neto al ancla con la tasa anual ``discount_rate``.
+
+    ``discount_rate`` puede ser un arreglo que se difunde con las series.
+    """
+    flows = np.asarray(flows, dtype=float)
+    v = monthly_discount(np.asarray(discount_rate, dtype=float))
+    weights = v[..., None] ** np.arange(1, flows.shape[-1] + 1)
+    if weights.ndim == 1:
+        return flows @ weights - investment
+    return (flows * weights).sum(axis=-1) - investment
+
+
+def _present_value(flows: np.ndarray, v: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """``v * P(v)`` y su derivada respecto de ``v``, con ``P(v) = sum(flujo_t * v**t)``.
+
+    ``flows`` viene con el mes en el primer eje, para que cada paso de Horner
+    lea una columna contigua.
+    """
+    value = np.zeros_like(v)
+    slope = np.zeros_like(v)
+    for column in flows[::-1]:
+        slope *= v
+        slope += value
+        value *= v
+        value += column
+    return v * value, value + v * slope
+
+
+def irr(flows: np.ndarray, investment: float, tol: float = 1e-10, max_iter: int = 100) -> np.ndarray:
+    """Tasa interna de retorno anual (fracción) de cada serie de ``flows``.
+
+    Las series sin ingresos no tienen TIR y devuelven ``nan``.
+    """
+    flows = np.ascontiguousarray(np.moveaxis(np.asarray(flows), -1, 0), dtype=float)
+    batch = flows.shape[1:]
+    solvable = flows.sum(axis=0) > 0
+
+    lo = np.zeros(batch)
+    hi = np.ones(batch)
+    for _ in range(max_iter):
+        low_value = _present_value(flows, hi)[0] < investment
+        if not (low_value & solvable).any():
+            break
+        lo = np.where(low_value, hi, lo)
+        hi = np.where(low_value, hi * 2, hi)
+
+    # Punto de partida: la serie concentrada en su duración media (tiempo ponderado por ingresos).
+    total = flows.sum(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        duration = np.tensordot(np.arange(1, len(flows) + 1), flows, axes=1) / total
+        v = np.clip((investment / total) ** (1 / duration), lo, hi)
+    v = np.where(solvable, v, hi)
+    for _ in range(max_iter):
+        value, slope = _present_value(flows, v)
+        excess = value - investment
+        lo = np.where(excess < 0, v, lo)
+        hi = np.where(excess > 0, v, hi)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            newton = v - excess / slope
+        inside = (newton >= lo) & (newton <= hi)
+        step = np.where(inside, newton, (lo + hi) / 2) - v
+        v = v + step
+        if np.all((np.abs(step) <= tol * v) | ~solvable):
+            break
+    return np.where(solvable, v ** -MONTHS_PER_YEAR - 1, np.nan)
+
+
+def payback_months(flows: np.ndarray, investment: float) -> np.ndarray:
+    """Primer mes en que los ingresos acumulados cubren la inversión (sin descontar)."""
+    reached = np.cumsum(flows, axis=-1) >= investment
+    return np.where(reached.any(axis=-1), reached.argmax(axis=-1) + 1.0, np.inf)
+
+
+def return_metrics(flows: np.ndarray, investment: float, discount_rate: float) -> ReturnMetrics:
+    return ReturnMetrics(npv(flows, investment, discount_rate), irr(flows, investment), payback_months(flows, investment))
@@ -0,0 +1,162 @@
+"""Instantánea de arranque con la vista por defecto ya calculada.
+
+Un proceso nuevo pinta primero la vista por defecto (IPC 4.5 %, crecimiento
+2 %, 10 años). Sus indicadores y la tabla anual formateada se guardan en
+``.cache/startup_snapshot.json`` junto con la huella de los datos de los que
+salen (histórico, inversión inicial y versión del modelo). La app lee la
+instantánea solo con ``json``, sin importar NumPy ni pandas, así que la
+cabecera y las tarjetas se pintan antes de cargar esas bibliotecas. Si la
+huella no coincide, la instantánea se recalcula y se reescribe. La instantánea
+guarda además el ancla del histórico y se compara con la vigente en cada
+ejecución, de modo que un mes anexado con :meth:`HistoryStore.append` la
+invalida en el mismo proceso. Para generarla por adelantado, p. ej. al
+construir la imagen::
+
+    python -m utils.snapshot
+"""
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from typing import NamedTuple
+
+CACHE_DIR = Path(os.environ.get("NAO_CACHE_DIR", Path(__file__).resolve().parent.parent / ".cache"))
+SNAPSHOT_FILE = CACHE_DIR / "startup_snapshot.json"
+
+# Se incrementa cuando cambia la forma de calcular las proyecciones o el contenido de la instantánea.
+SNAPSHOT_VERSION = 3
+
+DEFAULT_IPC_RATE = 4.5
+DEFAULT_GROWTH_FACTOR = 2.0
+DEFAULT_YEARS = 10
+DEFAULT_VIEW = (DEFAULT_IPC_RATE, DEFAULT_GROWTH_FACTOR, DEFAULT_YEARS)
+# Tasa de descuento anual para el VPN, en puntos porcentuales.
+DEFAULT_DISCOUNT_RATE = 10.0
+
+
+class Snapshot(NamedTuple):
+    closed_year: int
+    closed_year_revenue: float
+    current_yield: float
+    # Último mes cerrado del histórico (``YYYY-MM``); rotula los bloques anuales proyectados.
+    anchor: str
+    final_revenue: dict[str, float]
+    cumulative_revenue: dict[str, float]
+    # VPN a ``DEFAULT_DISCOUNT_RATE``, TIR y meses de recuperación por escenario.
+    npv: dict[str, float]
+    irr: dict[str, float]
+    payback: dict[str, float]
+    # Tabla anual formateada por unidad de medida: ``{"columns": [...], "data": [[...], ...]}``.
+    tables: dict[str, dict]
+
+
+def data_hash(history: list[dict], initial_investment: float) -> str:
+    """Huella de los datos y parámetros de los que depende la instantánea."""
+    payload = {
+        "version": SNAPSHOT_VERSION,
+        "view": DEFAULT_VIEW,
+        "discount_rate": DEFAULT_DISCOUNT_RATE,
+        "initial_investment": initial_investment,
+        # Normalizado como en ``HistoryStore`` para que ambas fuentes den la misma huella.
+        "history": [{"date": row["date"][:7], "value": float(row["value"])} for row in history],
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def load_snapshot(expected: str, path: Path = SNAPSHOT_FILE) -> Snapshot | None:
+    """Instantánea guardada si existe y su huella es ``expected``."""
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if payload.get("data_hash") != expected:
+        return None
+    return Snapshot(**payload["snapshot"])
+
+
+def build_snapshot(expected: str, path: Path = SNAPSHOT_FILE) -> Snapshot:
+    """Calcula la vista por defecto con los valores derivados de la app y la escribe de forma atómica."""
+    from constants import INITIAL_INVESTMENT
+    from utils import derived
+    from utils.finance import SCENARIOS
+    from utils.history import history_store
+
+    store = history_store()
+    metrics = derived.returns(*DEFAULT_VIEW, DEFAULT_DISCOUNT_RATE)
+    tables = {}
+    for view_mode in ("value", "percent"):
+        table = derived.table(*DEFAULT_VIEW, "yearly", view_mode)
+        tables[view_mode] = {"columns": list(table.columns), "data": table.to_numpy().tolist()}
+    snapshot = Snapshot(
+        closed_year=store.latest_closed_year,
+        closed_year_revenue=store.annual.get(store.latest_closed_year, 0.0),
+        current_yield=store.latest_year_yield(INITIAL_INVESTMENT),
+        anchor=store.anchor.strftime("%Y-%m"),
+        final_revenue={scenario: derived.final_revenue(*DEFAULT_VIEW, scenario) for scenario in SCENARIOS},
+        cumulative_revenue={scenario: derived.cumulative_revenue(*DEFAULT_VIEW, scenario) for scenario in SCENARIOS},
+        npv=dict(zip(SCENARIOS, metrics.npv.tolist())),
+        irr=dict(zip(SCENARIOS, metrics.irr.tolist())),
+        payback=dict(zip(SCENARIOS, metrics.payback.tolist())),
+        tables=tables,
+    )
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile("w", dir=path.parent, suffix=".json", delete=False, encoding="utf-8") as fh:
+        json.dump({"data_hash": expected, "snapshot": snapshot._asdict()}, fh)
+    os.chmod(fh.name, 0o644)
+    os.replace(fh.name, path)
+    return snapshot
+
+
+def current_history() -> list[dict]:
+    """Histórico vigente del proceso sin importar pandas.
+
+    Si el proceso ya creó el histórico compartido de :mod:`utils.history`, es
+    el suyo (puede tener meses anexados); si no, el de ``constants``.
+    """
+    history = sys.modules.get("utils.history")
+    store = history.current_store() if history is not None else None
+    if store is not None:
+        return store.months
+    from constants import HISTORICAL_DATA
+
+    return HISTORICAL_DATA
+
+
+_loaded: dict[Path, Snapshot] = {}
+_loaded_lock = threading.Lock()
+
+
+def startup_snapshot(path: Path = SNAPSHOT_FILE) -> Snapshot:
+    """Instantánea de la vista por defecto para el histórico vigente.
+
+    Se lee una vez por proceso y en cada llamada se compara su ancla con la del
+    histórico; si cerró un mes nuevo, se vuelve a leer o a calcular.
+    """
+    history = current_history()
+    anchor = history[-1]["date"][:7]
+    with _loaded_lock:
+        snapshot = _loaded.get(path)
+        if snapshot is None or snapshot.anchor != anchor:
+            from constants import INITIAL_INVESTMENT
+
+            expected = data_hash(history, INITIAL_INVESTMENT)
+            snapshot = _loaded[path] = load_snapshot(expected, path) or build_snapshot(expected, path)
+    return snapshot
+
+
+def forget_snapshots() -> None:
+    """Olvida las instantáneas leídas por el proceso; la próxima llamada las vuelve a validar."""
+    with _loaded_lock:
+        _loaded.clear()
+
+
+if __name__ == "__main__":
+    from constants import INITIAL_INVESTMENT
+
+    build_snapshot(data_hash(current_history(), INITIAL_INVESTMENT))
+    print(f"Instantánea escrita en {SNAPSHOT_FILE}")
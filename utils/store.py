@@ -0,0 +1,231 @@
+"""Almacén compartido de arreglos de proyección de solo lectura.
+
+Los arreglos grandes que no dependen de la sesión (el cubo de proyecciones, la
+TIR de toda la retícula) se guardan una sola vez por huella de datos en
+``.cache/store/<nombre>.<huella>.npy`` y cada proceso los abre con ``mmap``:
+todas las sesiones de un proceso y todos los procesos de la máquina leen las
+mismas páginas de la caché del sistema operativo sin copiarlas.
+
+La vida de cada segmento se lleva con referencias en dos niveles. Dentro del
+proceso, :meth:`ArrayStore.acquire` entrega un :class:`Lease` y suma una
+referencia; al liberar la última el proceso olvida el segmento y cierra su
+descriptor. Entre procesos, el descriptor abierto mantiene un ``flock``
+compartido sobre el archivo; el mapeo comparte esa descripción de archivo, así
+que el bloqueo dura mientras quede viva alguna vista del arreglo aunque ya no
+haya referencias. :meth:`ArrayStore.collect` borra un segmento reemplazado por
+una huella más nueva solo si consigue el bloqueo exclusivo, es decir, si ningún
+proceso lo tiene mapeado.
+"""
+
+import os
+import tempfile
+import threading
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - fuera de POSIX no se recolectan segmentos
+    fcntl = None
+
+CACHE_DIR = Path(os.environ.get("NAO_CACHE_DIR", Path(__file__).resolve().parent.parent / ".cache"))
+STORE_DIR = CACHE_DIR / "store"
+
+# Caracteres de la huella usados en el nombre del archivo.
+FINGERPRINT_CHARS = 16
+
+
+class Segment:
+    """Arreglo mapeado de un archivo del almacén con su contador de referencias del proceso."""
+
+    def __init__(self, name: str, fingerprint: str, path: Path, array: np.ndarray, fd: int | None):
+        self.name = name
+        self.fingerprint = fingerprint
+        self.path = path
+        self.array = array
+        self.fd = fd
+        self.refs = 0
+
+    @property
+    def nbytes(self) -> int:
+        return self.array.nbytes
+
+
+class Lease:
+    """Referencia a un segmento; se libera con :meth:`release` o al salir de un bloque ``with``."""
+
+    def __init__(self, store: "ArrayStore", segment: Segment):
+        self._store = store
+        self._segment = segment
+        self._released = False
+
+    @property
+    def array(self) -> np.ndarray:
+        return self._segment.array
+
+    @property
+    def path(self) -> Path:
+        return self._segment.path
+
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            self._store._release(self._segment)
+
+    def __enter__(self) -> np.ndarray:
+        return self.array
+
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+
+class ArrayStore:
+    """Segmentos del almacén abiertos por el proceso.
+
+    Los segmentos cuyo nombre empieza con alguno de ``private`` se calculan en
+    la memoria privada del proceso, sin archivo, como antes de existir el
+    almacén; sirve de referencia para medir lo que ahorra compartirlos.
+    """
+
+    def __init__(self, directory: Path = STORE_DIR, private: tuple[str, ...] = ()):
+        self.directory = directory
+        self.private = private
+        self._segments: dict[tuple[str, str], Segment] = {}
+        self._lock = threading.Lock()
+
+    def path(self, name: str, fingerprint: str) -> Path:
+        return self.directory / f"{name}.{fingerprint[:FINGERPRINT_CHARS]}.npy"
+
+    def acquire(self, name: str, fingerprint: str, build: Callable[[], np.ndarray]) -> Lease:
+        """Segmento ``name`` para la huella ``fingerprint``; lo calcula con ``build`` si no existe.
+
+        Si otro proceso calcula el mismo segmento a la vez, gana el primero en
+        publicarlo y el otro descarta su copia, así que todos mapean el mismo
+        archivo y sus páginas se cargan una sola vez.
+        """
+        key = (name, fingerprint)
+        with self._lock:
+            segment = self._segments.get(key)
+            if segment is None:
+                segment = self._segments[key] = self._open(name, fingerprint, build)
+            segment.refs += 1
+            return Lease(self, segment)
+
+    def _open(self, name: str, fingerprint: str, build: Callable[[], np.ndarray]) -> Segment:
+        path = self.path(name, fingerprint)
+        if name.startswith(self.private):
+            array = np.ascontiguousarray(build())
+            array.flags.writeable = False
+            return Segment(name, fingerprint, path, array, None)
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except FileNotFoundError:
+            self._write(path, build())
+            fd = os.open(path, os.O_RDONLY)
+        if fcntl is not None:
+            # Referencia entre procesos: mientras el descriptor esté abierto nadie puede borrar el segmento.
+            fcntl.flock(fd, fcntl.LOCK_SH)
+        # Se mapea por el descriptor y no por la ruta: el mapeo y el bloqueo apuntan al
+        # mismo inodo aunque el archivo se haya reemplazado, y el bloqueo vive con el mapeo.
+        with os.fdopen(os.dup(fd), "rb") as fh:
+            read_header = {(1, 0): np.lib.format.read_array_header_1_0}.get(
+                np.lib.format.read_magic(fh), np.lib.format.read_array_header_2_0
+            )
+            shape, fortran_order, dtype = read_header(fh)
+            array = np.memmap(fh, dtype, "r", fh.tell(), shape, "F" if fortran_order else "C")
+        return Segment(name, fingerprint, path, array, fd)
+
+    @staticmethod
+    def _write(path: Path, array: np.ndarray) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=path.parent, suffix=".tmp", delete=False) as fh:
+            np.save(fh, np.ascontiguousarray(array))
+        os.chmod(fh.name, 0o644)
+        # ``link`` no reemplaza un archivo existente: reemplazarlo dejaría a los procesos
+        # que ya lo mapearon con otra copia de las mismas páginas.
+        try:
+            os.link(fh.name, path)
+        except FileExistsError:
+            pass
+        finally:
+            os.unlink(fh.name)
+
+    def _release(self, segment: Segment) -> None:
+        with self._lock:
+            segment.refs -= 1
+            if segment.refs > 0:
+                return
+            del self._segments[segment.name, segment.fingerprint]
+            if segment.fd is not None:
+                os.close(segment.fd)
+            superseded = any(name == segment.name for name, _ in self._segments)
+        if superseded:
+            self.collect(segment.name)
+
+    def collect(self, name: str | None = None) -> list[Path]:
+        """Borra los segmentos que ningún proceso tiene abiertos y que ya no usa este proceso.
+
+        Con ``name`` solo se revisan los segmentos de ese arreglo. Un segmento
+        sin abrir pero con la huella de uno abierto en este proceso nunca se
+        borra, así que el almacén conserva al menos la versión vigente.
+        """
+        if fcntl is None:
+            return []
+        removed = []
+        with self._lock:
+            live = {self.path(*key) for key in self._segments}
+            names = {key[0] for key in self._segments}
+        for path in sorted(self.directory.glob(f"{name or '*'}.*.npy")):
+            segment_name = path.name.rsplit(".", 2)[0]
+            if path in live or segment_name not in names:
+                continue
+            try:
+                fd = os.open(path, os.O_RDONLY)
+            except FileNotFoundError:
+                continue
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+                continue
+            try:
+                path.unlink(missing_ok=True)
+                removed.append(path)
+            finally:
+                os.close(fd)
+        return removed
+
+    def segments(self) -> list[dict]:
+        """Segmentos abiertos por el proceso con sus referencias, para el panel de depuración."""
+        with self._lock:
+            return [
+                {
+                    "segmento": segment.name,
+                    "huella": segment.fingerprint[:FINGERPRINT_CHARS],
+                    "referencias": segment.refs,
+                    "MB": round(segment.nbytes / 2**20, 2),
+                }
+                for segment in self._segments.values()
+            ]
+
+
+_stores: dict[Path, ArrayStore] = {}
+_stores_lock = threading.Lock()
+
+
+def array_store(directory: Path = STORE_DIR) -> ArrayStore:
+    """Almacén del proceso para ``directory``, creado la primera vez."""
+    with _stores_lock:
+        store = _stores.get(directory)
+        if store is None:
+            store = _stores[directory] = ArrayStore(directory)
+        return store
+
+
+def set_array_store(store: ArrayStore) -> ArrayStore:
+    """Reemplaza el almacén del proceso para el directorio de ``store``."""
+    with _stores_lock:
+        _stores[store.directory] = store
+        return store
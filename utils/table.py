@@ -0,0 +1,64 @@
+"""Tabla Detallada de Rentabilidad: formato por columnas y paginación.
+
+Las columnas numéricas se formatean en una sola pasada por columna, con el
+formateador de ``str`` aplicado sobre el arreglo completo en lugar de llamar a
+``format_currency`` o ``format_percentage`` por celda; con los tamaños de esta
+tabla resulta más rápido que las operaciones de texto de NumPy. La app envía al
+navegador solo la página visible y la vista "% ROI" divide las mismas columnas
+numéricas por un divisor calculado una sola vez.
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+
+from utils.finance import SCENARIOS
+
+PAGE_SIZE = 24
+
+COLUMN_NAMES = {"pessimistic": "Pesimista", "moderate": "Moderado", "optimistic": "Optimista"}
+
+
+def format_currency_column(values: np.ndarray) -> np.ndarray:
+    """Versión por columnas de :func:`utils.formatting.format_currency`."""
+    values = np.asarray(values, dtype=float)
+    digits = map("{:,.0f}".format, np.abs(values).tolist())
+    grouped = np.fromiter((text.replace(",", ".") for text in digits), dtype=object, count=len(values))
+    return np.where(values < 0, "-$ ", "$ ").astype(object) + grouped
+
+
+def format_percentage_column(values: np.ndarray) -> np.ndarray:
+    """Versión por columnas de :func:`utils.formatting.format_percentage`."""
+    return np.fromiter(map("{:.2%}".format, np.asarray(values, dtype=float).tolist()), dtype=object)
+
+
+def percent_divisor(initial_investment: float, time_granularity: str) -> float:
+    """Inversión de referencia por período: anual completa o una doceava parte por mes."""
+    return initial_investment / (1 if time_granularity == "yearly" else 12)
+
+
+def formatted_table(
+    table: pd.DataFrame, view_mode: str, time_granularity: str, initial_investment: float
+) -> pd.DataFrame:
+    """Tabla completa ya formateada, con encabezados en español."""
+    period = "year" if time_granularity == "yearly" else "date"
+    values = table[list(SCENARIOS)].to_numpy()
+    if view_mode == "value":
+        formatted = format_currency_column(values.ravel())
+    else:
+        formatted = format_percentage_column(values.ravel() / percent_divisor(initial_investment, time_granularity))
+    formatted = formatted.reshape(values.shape)
+    frame = pd.DataFrame({COLUMN_NAMES[scenario]: formatted[:, i] for i, scenario in enumerate(SCENARIOS)})
+    frame.insert(0, "Año" if time_granularity == "yearly" else "Período", table[period].astype(str).to_numpy())
+    return frame
+
+
+def page_count(rows: int, page_size: int = PAGE_SIZE) -> int:
+    return max(math.ceil(rows / page_size), 1)
+
+
+def page(frame: pd.DataFrame, number: int, page_size: int = PAGE_SIZE) -> pd.DataFrame:
+    """Filas de la página ``number`` (base 1)."""
+    start = (number - 1) * page_size
+    return frame.iloc[start:start + page_size]